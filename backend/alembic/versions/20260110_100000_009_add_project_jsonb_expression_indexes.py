@@ -0,0 +1,41 @@
+"""Add expression indexes on hot project JSONB paths
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-01-10 10:00:00.000000+00:00
+
+Adds B-tree expression indexes for equality lookups on:
+- beneficiary->>'vat_id' (partial, only rows with vat_id)
+- project->>'project_title'
+- project->>'file_reference' (partial, only rows with file_reference)
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_projects_vat_id "
+        "ON projects ((beneficiary->>'vat_id')) WHERE beneficiary ? 'vat_id'"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_projects_title "
+        "ON projects ((project->>'project_title'))"
+    )
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_projects_file_ref "
+        "ON projects ((project->>'file_reference')) WHERE project ? 'file_reference'"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_projects_file_ref")
+    op.execute("DROP INDEX IF EXISTS idx_projects_title")
+    op.execute("DROP INDEX IF EXISTS idx_projects_vat_id")
@@ -0,0 +1,81 @@
+"""Promote hot project JSONB scalars to generated columns
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-01-10 11:00:00.000000+00:00
+
+Adds STORED generated columns derived from the JSONB payload:
+- project_title, file_reference, funding_rate_percent (from project)
+- beneficiary_name, beneficiary_vat_id (from beneficiary)
+
+The expression indexes from revision 009 are replaced by plain B-tree
+indexes on the generated columns (same index names).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+GENERATED_COLUMNS = [
+    ("project_title", sa.Text(), "project->>'project_title'"),
+    ("file_reference", sa.Text(), "project->>'file_reference'"),
+    (
+        "funding_rate_percent",
+        sa.Float(),
+        "(project->>'funding_rate_percent')::double precision",
+    ),
+    ("beneficiary_name", sa.Text(), "beneficiary->>'name'"),
+    ("beneficiary_vat_id", sa.Text(), "beneficiary->>'vat_id'"),
+]
+
+
+def upgrade() -> None:
+    for name, type_, expression in GENERATED_COLUMNS:
+        op.add_column(
+            "projects",
+            sa.Column(name, type_, sa.Computed(expression, persisted=True), nullable=True),
+        )
+
+    # Expression-Indizes aus 009 durch Spalten-Indizes ersetzen
+    op.execute("DROP INDEX IF EXISTS idx_projects_vat_id")
+    op.execute("DROP INDEX IF EXISTS idx_projects_title")
+    op.execute("DROP INDEX IF EXISTS idx_projects_file_ref")
+
+    op.create_index(
+        "idx_projects_vat_id",
+        "projects",
+        ["beneficiary_vat_id"],
+        postgresql_where=sa.text("beneficiary_vat_id IS NOT NULL"),
+    )
+    op.create_index("idx_projects_title", "projects", ["project_title"])
+    op.create_index(
+        "idx_projects_file_ref",
+        "projects",
+        ["file_reference"],
+        postgresql_where=sa.text("file_reference IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_projects_file_ref", table_name="projects")
+    op.drop_index("idx_projects_title", table_name="projects")
+    op.drop_index("idx_projects_vat_id", table_name="projects")
+
+    for name, _, _ in reversed(GENERATED_COLUMNS):
+        op.drop_column("projects", name)
+
+    op.execute(
+        "CREATE INDEX idx_projects_vat_id "
+        "ON projects ((beneficiary->>'vat_id')) WHERE beneficiary ? 'vat_id'"
+    )
+    op.execute("CREATE INDEX idx_projects_title ON projects ((project->>'project_title'))")
+    op.execute(
+        "CREATE INDEX idx_projects_file_ref "
+        "ON projects ((project->>'file_reference')) WHERE project ? 'file_reference'"
+    )
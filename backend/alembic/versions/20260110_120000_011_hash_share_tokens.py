@@ -0,0 +1,52 @@
+"""Store share tokens as SHA-256 hashes
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-01-10 12:00:00.000000+00:00
+
+Replaces the plaintext share_token columns on projects and project_shares
+with share_token_hash (BYTEA, 32 bytes, unique index). Existing tokens are
+hashed in place so already issued links keep working.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ["projects", "project_shares"]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column("share_token_hash", sa.LargeBinary(32), nullable=True),
+        )
+        # Bestehende Tokens hashen (sha256() ist ab PostgreSQL 11 eingebaut)
+        op.execute(
+            f"UPDATE {table} SET share_token_hash = sha256(convert_to(share_token, 'UTF8')) "
+            "WHERE share_token IS NOT NULL"
+        )
+        op.drop_index(f"ix_{table}_share_token", table_name=table)
+        op.drop_column(table, "share_token")
+        op.create_index(
+            f"ix_{table}_share_token_hash", table, ["share_token_hash"], unique=True
+        )
+
+
+def downgrade() -> None:
+    # Klartext-Tokens lassen sich nicht wiederherstellen; Links müssen neu erzeugt werden
+    for table in reversed(TABLES):
+        op.drop_index(f"ix_{table}_share_token_hash", table_name=table)
+        op.drop_column(table, "share_token_hash")
+        op.add_column(
+            table,
+            sa.Column("share_token", sa.String(64), nullable=True, unique=True),
+        )
+        op.create_index(f"ix_{table}_share_token", table, ["share_token"])
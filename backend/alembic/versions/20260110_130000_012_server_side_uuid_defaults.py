@@ -0,0 +1,32 @@
+"""Generate primary keys server-side with gen_random_uuid()
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-01-10 13:00:00.000000+00:00
+
+Sets gen_random_uuid() (built into PostgreSQL 13+) as column default for
+the id columns of projects, project_shares, final_results,
+analysis_results and rulesets.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ["projects", "project_shares", "final_results", "analysis_results", "rulesets"]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, "id", server_default=sa.text("gen_random_uuid()"))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, "id", server_default=None)
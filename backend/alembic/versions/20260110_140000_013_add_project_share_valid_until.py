@@ -0,0 +1,39 @@
+"""Add indexed valid_until column to project_shares
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-01-10 14:00:00.000000+00:00
+
+A partial index on "expires_at > now()" is not possible (index predicates
+must be immutable). Instead valid_until = COALESCE(expires_at, 'infinity')
+is stored as generated column with a plain B-tree index, so validity
+filters become "valid_until > now()" index scans.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "project_shares",
+        sa.Column(
+            "valid_until",
+            sa.DateTime(timezone=True),
+            sa.Computed("COALESCE(expires_at, 'infinity'::timestamptz)", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index("idx_project_shares_valid", "project_shares", ["valid_until"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_project_shares_valid", table_name="project_shares")
+    op.drop_column("project_shares", "valid_until")
@@ -0,0 +1,62 @@
+"""Native enum for final_results.status, generated traffic_light column
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-01-10 15:00:00.000000+00:00
+
+- final_results.status: VARCHAR(50) -> native ENUM resultstatus
+- final_results.traffic_light: generated from overall->>'traffic_light', indexed
+
+traffic_light stays a VARCHAR: casting text to an enum type is not
+immutable and therefore not allowed in a generated column expression.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+result_status = postgresql.ENUM(
+    "PENDING", "REVIEW_PENDING", "ACCEPTED", "REJECTED", name="resultstatus"
+)
+
+
+def upgrade() -> None:
+    result_status.create(op.get_bind(), checkfirst=True)
+    op.alter_column("final_results", "status", server_default=None)
+    op.alter_column(
+        "final_results",
+        "status",
+        type_=result_status,
+        postgresql_using="status::resultstatus",
+    )
+
+    op.add_column(
+        "final_results",
+        sa.Column(
+            "traffic_light",
+            sa.String(10),
+            sa.Computed("overall->>'traffic_light'", persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index("idx_final_results_traffic_light", "final_results", ["traffic_light"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_final_results_traffic_light", table_name="final_results")
+    op.drop_column("final_results", "traffic_light")
+
+    op.alter_column(
+        "final_results",
+        "status",
+        type_=sa.String(50),
+        postgresql_using="status::text",
+    )
+    result_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,42 @@
+"""Add document/time indexes to final_results
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-01-10 16:00:00.000000+00:00
+
+- ix_final_results_document_created: B-tree (document_id, created_at) for
+  "latest result of a document" lookups
+- brin_final_results_created_at: BRIN on created_at for time-range scans
+
+Range partitioning by created_at was considered but not applied:
+feedback.final_result_id references final_results.id, and a unique key on
+a partitioned table must contain the partition key.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_final_results_document_created",
+        "final_results",
+        ["document_id", "created_at"],
+    )
+    op.create_index(
+        "brin_final_results_created_at",
+        "final_results",
+        ["created_at"],
+        postgresql_using="brin",
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("brin_final_results_created_at", table_name="final_results")
+    op.drop_index("ix_final_results_document_created", table_name="final_results")
@@ -0,0 +1,106 @@
+"""Stamp created_at/updated_at in the database
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-01-10 17:00:00.000000+00:00
+
+- DEFAULT now() on all creation/update timestamp columns (previously set
+  per row from Python with naive datetime.utcnow())
+- set_updated_at() trigger: BEFORE UPDATE sets updated_at := now(), so
+  bulk updates outside the ORM keep the column current as well
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CREATED_AT_TABLES = [
+    "analysis_results",
+    "api_keys",
+    "batch_jobs",
+    "custom_criteria",
+    "document_type_settings",
+    "documents",
+    "export_jobs",
+    "feedback",
+    "final_results",
+    "generator_jobs",
+    "llm_runs",
+    "model_registry",
+    "parse_runs",
+    "precheck_runs",
+    "prepare_payloads",
+    "project_shares",
+    "projects",
+    "rag_examples",
+    "ruleset_checker_settings",
+    "ruleset_samples",
+    "rulesets",
+    "solution_files",
+    "solution_matches",
+    "training_datasets",
+    "training_examples",
+    "training_runs",
+    "users",
+]
+
+UPDATED_AT_TABLES = [
+    "api_keys",
+    "custom_criteria",
+    "document_type_settings",
+    "documents",
+    "final_results",
+    "projects",
+    "ruleset_checker_settings",
+    "ruleset_samples",
+    "rulesets",
+    "settings",
+    "solution_files",
+]
+
+TIMESTAMP_TABLES = ["audit_events", "llm_run_logs"]
+
+
+def _timestamp_columns() -> list[tuple[str, str]]:
+    return (
+        [(table, "created_at") for table in CREATED_AT_TABLES]
+        + [(table, "updated_at") for table in UPDATED_AT_TABLES]
+        + [(table, "timestamp") for table in TIMESTAMP_TABLES]
+    )
+
+
+def upgrade() -> None:
+    for table, column in _timestamp_columns():
+        op.alter_column(table, column, server_default=sa.text("now()"))
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at := now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in UPDATED_AT_TABLES:
+        op.execute(
+            f"CREATE OR REPLACE TRIGGER trg_{table}_updated_at "
+            f"BEFORE UPDATE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+        )
+
+
+def downgrade() -> None:
+    for table in UPDATED_AT_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_{table}_updated_at ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
+
+    for table, column in _timestamp_columns():
+        op.alter_column(table, column, server_default=None)
@@ -0,0 +1,63 @@
+"""Add GIN (jsonb_path_ops) indexes on JSONB columns
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-01-10 18:00:00.000000+00:00
+
+jsonb_path_ops indexes support @> containment lookups (e.g.
+risk_checker @> '{"enabled": true}') and are roughly half the size of the
+default jsonb_ops. Built CONCURRENTLY so writes are not blocked.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "017"
+down_revision: Union[str, None] = "016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+GIN_COLUMNS = [
+    ("ruleset_checker_settings", "risk_checker"),
+    ("ruleset_checker_settings", "semantic_checker"),
+    ("ruleset_checker_settings", "economic_checker"),
+    ("ruleset_checker_settings", "legal_checker"),
+    ("ruleset_samples", "extracted_data"),
+    ("ruleset_samples", "ground_truth"),
+    ("ruleset_samples", "rag_example_ids"),
+    ("settings", "value"),
+    ("solution_files", "entries"),
+    ("solution_matches", "errors"),
+    ("solution_matches", "fields"),
+    ("training_examples", "label_json"),
+    ("training_datasets", "manifest"),
+    ("training_runs", "metrics"),
+    ("model_registry", "metrics"),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY ist in einer Transaktion nicht erlaubt
+    with op.get_context().autocommit_block():
+        for table, column in GIN_COLUMNS:
+            op.create_index(
+                f"idx_{table}_{column}_gin",
+                table,
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "jsonb_path_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, column in reversed(GIN_COLUMNS):
+            op.drop_index(
+                f"idx_{table}_{column}_gin",
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,63 @@
+"""Promote checker enabled/severity keys to generated columns
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-01-10 19:00:00.000000+00:00
+
+Adds STORED generated columns on ruleset_checker_settings for the keys used
+in filters ("which rulesets have the risk checker enabled?"):
+- <checker>_enabled (boolean, B-tree index) for risk/semantic/economic/legal
+- <checker>_severity (severity_threshold) for risk/semantic/economic
+
+Generated columns are backfilled by PostgreSQL and cannot drift from the
+JSONB source, so no sync CHECK constraint is needed.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "018"
+down_revision: Union[str, None] = "017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = "ruleset_checker_settings"
+
+ENABLED_COLUMNS = ["risk", "semantic", "economic", "legal"]
+SEVERITY_COLUMNS = ["risk", "semantic", "economic"]
+
+
+def upgrade() -> None:
+    for checker in ENABLED_COLUMNS:
+        op.add_column(
+            TABLE,
+            sa.Column(
+                f"{checker}_enabled",
+                sa.Boolean(),
+                sa.Computed(f"({checker}_checker->>'enabled')::boolean", persisted=True),
+                nullable=True,
+            ),
+        )
+        op.create_index(f"ix_{TABLE}_{checker}_enabled", TABLE, [f"{checker}_enabled"])
+
+    for checker in SEVERITY_COLUMNS:
+        op.add_column(
+            TABLE,
+            sa.Column(
+                f"{checker}_severity",
+                sa.String(10),
+                sa.Computed(f"{checker}_checker->>'severity_threshold'", persisted=True),
+                nullable=True,
+            ),
+        )
+
+
+def downgrade() -> None:
+    for checker in reversed(SEVERITY_COLUMNS):
+        op.drop_column(TABLE, f"{checker}_severity")
+
+    for checker in reversed(ENABLED_COLUMNS):
+        op.drop_index(f"ix_{TABLE}_{checker}_enabled", table_name=TABLE)
+        op.drop_column(TABLE, f"{checker}_enabled")
@@ -0,0 +1,45 @@
+"""Generate remaining primary keys server-side with gen_random_uuid()
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-01-10 20:00:00.000000+00:00
+
+Extends 012 to the ruleset checker/sample, settings, solution and training
+tables. users.id stays VARCHAR(36) (demo users use non-UUID ids) and gets
+gen_random_uuid()::text as default.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "019"
+down_revision: Union[str, None] = "018"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = [
+    "ruleset_checker_settings",
+    "ruleset_samples",
+    "settings",
+    "api_keys",
+    "solution_files",
+    "solution_matches",
+    "training_examples",
+    "training_datasets",
+    "training_runs",
+    "model_registry",
+]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.alter_column(table, "id", server_default=sa.text("gen_random_uuid()"))
+    op.alter_column("users", "id", server_default=sa.text("gen_random_uuid()::text"))
+
+
+def downgrade() -> None:
+    op.alter_column("users", "id", server_default=None)
+    for table in TABLES:
+        op.alter_column(table, "id", server_default=None)
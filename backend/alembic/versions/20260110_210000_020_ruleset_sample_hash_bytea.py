@@ -0,0 +1,42 @@
+"""Store ruleset_samples.file_hash as 32-byte BYTEA
+
+Revision ID: 020
+Revises: 019
+Create Date: 2026-01-10 21:00:00.000000+00:00
+
+Converts the hex-encoded SHA-256 (VARCHAR(64)) to raw bytes. The index
+ix_ruleset_samples_file_hash is rebuilt by PostgreSQL with the new type
+and shrinks to about half its size.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "020"
+down_revision: Union[str, None] = "019"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "ruleset_samples",
+        "file_hash",
+        type_=sa.LargeBinary(32),
+        existing_type=sa.String(64),
+        existing_nullable=False,
+        postgresql_using="decode(file_hash, 'hex')",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "ruleset_samples",
+        "file_hash",
+        type_=sa.String(64),
+        existing_type=sa.LargeBinary(32),
+        existing_nullable=False,
+        postgresql_using="encode(file_hash, 'hex')",
+    )
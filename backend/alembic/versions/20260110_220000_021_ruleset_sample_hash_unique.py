@@ -0,0 +1,55 @@
+"""Unique (ruleset_id, file_hash) index for ruleset samples
+
+Revision ID: 021
+Revises: 020
+Create Date: 2026-01-10 22:00:00.000000+00:00
+
+Replaces the single-column ix_ruleset_samples_file_hash with a composite
+unique index matching the upload dedup lookup. Samples are hard-deleted
+(there is no DELETED status), so the index is not partial. Built
+CONCURRENTLY so uploads are not blocked.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "021"
+down_revision: Union[str, None] = "020"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "uq_ruleset_sample_hash",
+            "ruleset_samples",
+            ["ruleset_id", "file_hash"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_ruleset_samples_file_hash",
+            table_name="ruleset_samples",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_ruleset_samples_file_hash",
+            "ruleset_samples",
+            ["file_hash"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "uq_ruleset_sample_hash",
+            table_name="ruleset_samples",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
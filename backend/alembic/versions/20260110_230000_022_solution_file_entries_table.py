@@ -0,0 +1,126 @@
+"""Move solution file entries from JSONB into solution_file_entries
+
+Revision ID: 022
+Revises: 021
+Create Date: 2026-01-10 23:00:00.000000+00:00
+
+solution_files.entries (one JSONB array per file) is expanded into one row
+per entry, so entries can be paged and indexed (GIN on fields). Positions
+from CSV files may repeat, therefore (solution_file_id, position) is a
+plain composite index rather than a unique one.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "022"
+down_revision: Union[str, None] = "021"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "solution_file_entries",
+        sa.Column(
+            "id",
+            postgresql.UUID(as_uuid=False),
+            primary_key=True,
+            server_default=sa.text("gen_random_uuid()"),
+        ),
+        sa.Column(
+            "solution_file_id",
+            postgresql.UUID(as_uuid=False),
+            sa.ForeignKey("solution_files.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("filename", sa.String(255), nullable=False),
+        sa.Column("is_valid", sa.Boolean(), nullable=False),
+        sa.Column("errors", postgresql.JSONB(), nullable=False),
+        sa.Column("fields", postgresql.JSONB(), nullable=False),
+        sa.Column("template", sa.String(100), nullable=True),
+        sa.Column("generator_version", sa.String(50), nullable=True),
+    )
+
+    # Bestehende Arrays in Zeilen auflösen (Reihenfolge per ORDINALITY)
+    op.execute(
+        """
+        INSERT INTO solution_file_entries (
+            solution_file_id, position, filename, is_valid, errors, fields,
+            template, generator_version
+        )
+        SELECT
+            sf.id,
+            COALESCE((e.entry->>'position')::integer, e.ord::integer),
+            COALESCE(e.entry->>'filename', ''),
+            COALESCE((e.entry->>'is_valid')::boolean, true),
+            COALESCE(e.entry->'errors', '[]'::jsonb),
+            COALESCE(e.entry->'fields', '{}'::jsonb),
+            e.entry->>'template',
+            e.entry->>'generator_version'
+        FROM solution_files sf
+        CROSS JOIN LATERAL jsonb_array_elements(COALESCE(sf.entries, '[]'::jsonb))
+            WITH ORDINALITY AS e(entry, ord)
+        """
+    )
+
+    op.create_index(
+        "ix_solution_file_entries_file_position",
+        "solution_file_entries",
+        ["solution_file_id", "position"],
+    )
+    op.create_index(
+        "idx_solution_file_entries_fields_gin",
+        "solution_file_entries",
+        ["fields"],
+        postgresql_using="gin",
+        postgresql_ops={"fields": "jsonb_path_ops"},
+    )
+
+    op.drop_index(
+        "idx_solution_files_entries_gin", table_name="solution_files", if_exists=True
+    )
+    op.drop_column("solution_files", "entries")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "solution_files",
+        sa.Column("entries", postgresql.JSONB(), nullable=True),
+    )
+    op.execute(
+        """
+        UPDATE solution_files sf
+        SET entries = COALESCE(
+            (
+                SELECT jsonb_agg(
+                    jsonb_build_object(
+                        'position', e.position,
+                        'filename', e.filename,
+                        'is_valid', e.is_valid,
+                        'errors', e.errors,
+                        'fields', e.fields,
+                        'template', e.template,
+                        'generator_version', e.generator_version
+                    )
+                    ORDER BY e.position, e.id
+                )
+                FROM solution_file_entries e
+                WHERE e.solution_file_id = sf.id
+            ),
+            '[]'::jsonb
+        )
+        """
+    )
+    op.create_index(
+        "idx_solution_files_entries_gin",
+        "solution_files",
+        ["entries"],
+        postgresql_using="gin",
+        postgresql_ops={"entries": "jsonb_path_ops"},
+    )
+    op.drop_table("solution_file_entries")
@@ -0,0 +1,39 @@
+"""Store solution_matches.match_confidence as scaled SMALLINT
+
+Revision ID: 023
+Revises: 022
+Create Date: 2026-01-11 10:00:00.000000+00:00
+
+Confidence in [0, 1] is stored as value * 10000 (2 bytes instead of an
+8-byte double); e.g. a 0.8 threshold becomes 8000.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "023"
+down_revision: Union[str, None] = "022"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "solution_matches",
+        "match_confidence",
+        type_=sa.SmallInteger(),
+        existing_type=sa.Float(),
+        postgresql_using="round(LEAST(GREATEST(match_confidence, 0), 1) * 10000)::smallint",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "solution_matches",
+        "match_confidence",
+        type_=sa.Float(),
+        existing_type=sa.SmallInteger(),
+        postgresql_using="match_confidence / 10000.0",
+    )
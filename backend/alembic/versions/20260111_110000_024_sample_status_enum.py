@@ -0,0 +1,62 @@
+"""Native enum for ruleset_samples.status, partial review-queue index
+
+Revision ID: 024
+Revises: 023
+Create Date: 2026-01-11 11:00:00.000000+00:00
+
+- ruleset_samples.status: VARCHAR(20) -> native ENUM samplestatus
+- ix_ruleset_samples_status replaced by ix_ruleset_samples_pending on
+  ruleset_id, limited to UPLOADED/PENDING_REVIEW rows
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "024"
+down_revision: Union[str, None] = "023"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+sample_status = postgresql.ENUM(
+    "UPLOADED", "PROCESSING", "PENDING_REVIEW", "APPROVED", "REJECTED", name="samplestatus"
+)
+
+
+def upgrade() -> None:
+    op.drop_index("ix_ruleset_samples_status", table_name="ruleset_samples", if_exists=True)
+
+    sample_status.create(op.get_bind(), checkfirst=True)
+    op.alter_column(
+        "ruleset_samples",
+        "status",
+        type_=sample_status,
+        existing_type=sa.String(20),
+        existing_nullable=False,
+        postgresql_using="status::samplestatus",
+    )
+
+    op.create_index(
+        "ix_ruleset_samples_pending",
+        "ruleset_samples",
+        ["ruleset_id"],
+        postgresql_where=sa.text("status IN ('UPLOADED', 'PENDING_REVIEW')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ruleset_samples_pending", table_name="ruleset_samples")
+
+    op.alter_column(
+        "ruleset_samples",
+        "status",
+        type_=sa.String(20),
+        existing_type=sample_status,
+        existing_nullable=False,
+        postgresql_using="status::text",
+    )
+    sample_status.drop(op.get_bind(), checkfirst=True)
+
+    op.create_index("ix_ruleset_samples_status", "ruleset_samples", ["status"])
@@ -0,0 +1,39 @@
+"""Shrink api_keys.key_preview to VARCHAR(8)
+
+Revision ID: 025
+Revises: 024
+Create Date: 2026-01-11 12:00:00.000000+00:00
+
+key_preview only ever holds the last four characters of a key.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "025"
+down_revision: Union[str, None] = "024"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "api_keys",
+        "key_preview",
+        type_=sa.String(8),
+        existing_type=sa.String(50),
+        existing_nullable=True,
+        postgresql_using="right(key_preview, 8)",
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "api_keys",
+        "key_preview",
+        type_=sa.String(50),
+        existing_type=sa.String(8),
+        existing_nullable=True,
+    )
@@ -0,0 +1,55 @@
+"""Covering index on training_examples (module, project_id)
+
+Revision ID: 026
+Revises: 025
+Create Date: 2026-01-11 13:00:00.000000+00:00
+
+INCLUDE (label_json, source) lets the dataset export run as an index-only
+scan. The new index leads with module, so ix_training_examples_module is
+dropped as redundant. Built CONCURRENTLY so writes are not blocked.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "026"
+down_revision: Union[str, None] = "025"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY ist in einer Transaktion nicht erlaubt
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_training_examples_module_proj",
+            "training_examples",
+            ["module", "project_id"],
+            postgresql_include=["label_json", "source"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_training_examples_module",
+            table_name="training_examples",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_training_examples_module",
+            "training_examples",
+            ["module"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_training_examples_module_proj",
+            table_name="training_examples",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,42 @@
+"""Index ruleset_checker_settings.risk_severity
+
+Revision ID: 027
+Revises: 026
+Create Date: 2026-01-11 14:00:00.000000+00:00
+
+risk_severity is the generated column for
+risk_checker->>'severity_threshold' (added in 018). A b-tree index makes
+equality filters on the threshold index lookups. Built CONCURRENTLY so
+writes are not blocked.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "027"
+down_revision: Union[str, None] = "026"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY ist in einer Transaktion nicht erlaubt
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_ruleset_checker_settings_risk_severity",
+            "ruleset_checker_settings",
+            ["risk_severity"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_ruleset_checker_settings_risk_severity",
+            table_name="ruleset_checker_settings",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,54 @@
+"""Server-side JSONB defaults for ruleset_checker_settings
+
+Revision ID: 028
+Revises: 027
+Create Date: 2026-01-11 15:00:00.000000+00:00
+
+The four *_checker configs get their defaults from the database instead of
+a Python closure per insert.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "028"
+down_revision: Union[str, None] = "027"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHECKER_DEFAULTS = {
+    "risk_checker": (
+        '{"enabled":true,"severity_threshold":"MEDIUM","check_self_invoice":true,'
+        '"check_duplicate_invoice":true,"check_round_amounts":true,'
+        '"check_weekend_dates":true,"round_amount_threshold":1000}'
+    ),
+    "semantic_checker": (
+        '{"enabled":true,"severity_threshold":"MEDIUM","check_project_relevance":true,'
+        '"check_description_quality":true,"min_relevance_score":0.6,'
+        '"use_rag_context":true}'
+    ),
+    "economic_checker": (
+        '{"enabled":true,"severity_threshold":"LOW","check_budget_limits":true,'
+        '"check_unit_prices":true,"check_funding_rate":true,"max_deviation_percent":20}'
+    ),
+    "legal_checker": (
+        '{"enabled":false,"funding_period":"2021-2027","max_results":5,'
+        '"min_relevance_score":0.6,"use_hierarchy_weighting":true,'
+        '"include_definitions":true}'
+    ),
+}
+
+
+def upgrade() -> None:
+    for column, default in CHECKER_DEFAULTS.items():
+        op.alter_column(
+            "ruleset_checker_settings",
+            column,
+            server_default=default,
+        )
+
+
+def downgrade() -> None:
+    for column in CHECKER_DEFAULTS:
+        op.alter_column("ruleset_checker_settings", column, server_default=None)
@@ -0,0 +1,113 @@
+"""Partition training_examples by module
+
+Revision ID: 029
+Revises: 028
+Create Date: 2026-01-11 16:00:00.000000+00:00
+
+training_examples becomes a LIST-partitioned table with one partition per
+module (1-3) plus a DEFAULT partition. The primary key moves to
+(id, module) because PostgreSQL requires the partition key in every unique
+constraint. An existing table cannot be converted in place, so the rows are
+copied into a new partitioned table.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "029"
+down_revision: Union[str, None] = "028"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, document_id, project_id, module, label_json, source, created_at"
+SOURCE_COLUMNS = (
+    "id, document_id, project_id, module, label_json, source, coalesce(created_at, now())"
+)
+
+
+def _create_indexes() -> None:
+    op.create_index(
+        "ix_training_examples_module_proj",
+        "training_examples",
+        ["module", "project_id"],
+        postgresql_include=["label_json", "source"],
+    )
+    op.create_index(
+        "idx_training_examples_label_json_gin",
+        "training_examples",
+        ["label_json"],
+        postgresql_using="gin",
+        postgresql_ops={"label_json": "jsonb_path_ops"},
+    )
+
+
+def upgrade() -> None:
+    op.rename_table("training_examples", "training_examples_old")
+    # Der PK-Index-Name muss für die neue Tabelle frei werden
+    op.execute(
+        "ALTER TABLE training_examples_old "
+        "RENAME CONSTRAINT training_examples_pkey TO training_examples_old_pkey"
+    )
+    op.drop_index("ix_training_examples_module_proj", table_name="training_examples_old")
+    op.drop_index("idx_training_examples_label_json_gin", table_name="training_examples_old")
+
+    op.execute(
+        """
+        CREATE TABLE training_examples (
+            id UUID NOT NULL DEFAULT gen_random_uuid(),
+            document_id UUID REFERENCES documents (id),
+            project_id UUID REFERENCES projects (id),
+            module INTEGER NOT NULL,
+            label_json JSONB NOT NULL,
+            source VARCHAR(50) NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, module)
+        ) PARTITION BY LIST (module)
+        """
+    )
+    for module in (1, 2, 3):
+        op.execute(
+            f"CREATE TABLE training_examples_m{module} "
+            f"PARTITION OF training_examples FOR VALUES IN ({module})"
+        )
+    op.execute("CREATE TABLE training_examples_default PARTITION OF training_examples DEFAULT")
+
+    op.execute(
+        f"INSERT INTO training_examples ({COLUMNS}) "
+        f"SELECT {SOURCE_COLUMNS} FROM training_examples_old"
+    )
+    op.drop_table("training_examples_old")
+
+    _create_indexes()
+
+
+def downgrade() -> None:
+    op.rename_table("training_examples", "training_examples_part")
+    op.execute(
+        "ALTER TABLE training_examples_part "
+        "RENAME CONSTRAINT training_examples_pkey TO training_examples_part_pkey"
+    )
+    op.drop_index("ix_training_examples_module_proj", table_name="training_examples_part")
+    op.drop_index("idx_training_examples_label_json_gin", table_name="training_examples_part")
+
+    op.execute(
+        """
+        CREATE TABLE training_examples (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            document_id UUID REFERENCES documents (id),
+            project_id UUID REFERENCES projects (id),
+            module INTEGER NOT NULL,
+            label_json JSONB NOT NULL,
+            source VARCHAR(50) NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+        """
+    )
+    op.execute(
+        f"INSERT INTO training_examples ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM training_examples_part"
+    )
+    op.drop_table("training_examples_part")
+
+    _create_indexes()
@@ -0,0 +1,75 @@
+"""Reference solution file entries from solution_matches
+
+Revision ID: 030
+Revises: 029
+Create Date: 2026-01-11 17:00:00.000000+00:00
+
+solution_matches.solution_filename held a copy of the matched entry's
+filename. Matches now reference their entry through solution_entry_id, and
+the filename is read from solution_file_entries. Positions may repeat
+within a file (see 022), so existing matches are backfilled on
+(solution_file_id, position, filename) and take the first such entry.
+Matches without a matching entry keep solution_entry_id NULL.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "030"
+down_revision: Union[str, None] = "029"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "solution_matches",
+        sa.Column(
+            "solution_entry_id",
+            postgresql.UUID(as_uuid=False),
+            sa.ForeignKey("solution_file_entries.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+    op.execute(
+        """
+        UPDATE solution_matches m
+        SET solution_entry_id = e.id
+        FROM (
+            SELECT DISTINCT ON (solution_file_id, position, filename)
+                id, solution_file_id, position, filename
+            FROM solution_file_entries
+            ORDER BY solution_file_id, position, filename, id
+        ) e
+        WHERE e.solution_file_id = m.solution_file_id
+          AND e.position = m.solution_position
+          AND e.filename = m.solution_filename
+        """
+    )
+    op.create_index(
+        "ix_solution_matches_solution_entry_id",
+        "solution_matches",
+        ["solution_entry_id"],
+    )
+    op.drop_column("solution_matches", "solution_filename")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "solution_matches",
+        sa.Column("solution_filename", sa.String(255), nullable=False, server_default=""),
+    )
+    op.execute(
+        """
+        UPDATE solution_matches m
+        SET solution_filename = e.filename
+        FROM solution_file_entries e
+        WHERE e.id = m.solution_entry_id
+        """
+    )
+    op.alter_column("solution_matches", "solution_filename", server_default=None)
+    op.drop_index("ix_solution_matches_solution_entry_id", table_name="solution_matches")
+    op.drop_column("solution_matches", "solution_entry_id")
@@ -5,17 +5,19 @@ FlowAudit Feedback API
 Endpoints für Human-in-the-loop Feedback.
 """
 
+import asyncio
 import logging
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
 
 from app.database import get_async_session
 from app.models.document import Document, ParseRun
 from app.models.document_type import DocumentTypeSettings
-from app.models.enums import DocumentStatus
+from app.models.enums import DocumentStatus, ResultStatus, TrafficLight
 from app.models.feedback import Feedback, RagExample
 from app.models.llm import LlmRun
 from app.models.result import FinalResult
@@ -135,7 +137,8 @@ async def create_feedback(
                 # In ChromaDB speichern
                 try:
                     vectorstore = get_vectorstore()
-                    vectorstore.add_error_example(
+                    await asyncio.to_thread(
+                        vectorstore.add_error_example,
                         error_id=rag_example.id,
                         error_type=override.correction_type or "manual_correction",
                         feature_id=override.feature_id,
@@ -256,7 +259,7 @@ async def create_feedback(
                 )
 
                 logger.info(
-                    f"Learned from validated document {document_id} "
+                    f"Queued learning from validated document {document_id} "
                     f"(chunking: {chunking_config is not None})"
                 )
 
@@ -340,10 +343,11 @@ async def finalize_document(
     # Final Result erstellen
     final_result = FinalResult(
         document_id=document_id,
-        status="REVIEW_PENDING",
+        status=ResultStatus.REVIEW_PENDING,
+        computed=None,
         fields=[],
         overall={
-            "traffic_light": "YELLOW",
+            "traffic_light": TrafficLight.YELLOW.value,
             "missing_required_features": [],
             "conflicts": [],
         },
@@ -378,7 +382,9 @@ async def get_final_result(
         Finales Ergebnis.
     """
     result = await session.execute(
-        select(FinalResult).where(FinalResult.id == final_result_id)
+        select(FinalResult)
+        .where(FinalResult.id == final_result_id)
+        .options(undefer_group("payload"))
     )
     final_result = result.scalar_one_or_none()
 
@@ -420,6 +426,7 @@ async def get_document_final_result(
         .where(FinalResult.document_id == document_id)
         .order_by(FinalResult.created_at.desc())
         .limit(1)
+        .options(undefer_group("payload"))
     )
     final_result = result.scalar_one_or_none()
 
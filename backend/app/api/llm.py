@@ -400,9 +400,8 @@ async def get_llm_providers(
 
     # Default-Provider aus DB laden
     setting_key = "default_llm_provider"
-    result = await session.execute(select(Setting).where(Setting.key == setting_key))
-    setting = result.scalar_one_or_none()
-    default_provider = setting.value.get("provider", "LOCAL_OLLAMA") if setting else "LOCAL_OLLAMA"
+    value = await Setting.get_cached(session, setting_key)
+    default_provider = value.get("provider", "LOCAL_OLLAMA") if value else "LOCAL_OLLAMA"
 
     providers = [
         # === Lokale Provider ===
@@ -611,6 +610,7 @@ async def set_default_provider(
         session.add(setting)
 
     await session.commit()
+    Setting.invalidate_cache(setting_key)
 
     return {
         "success": True,
@@ -76,16 +76,16 @@ async def list_projects(
 
     if q:
         query = query.where(
-            Project.project["project_title"].astext.ilike(f"%{q}%")
-            | Project.beneficiary["name"].astext.ilike(f"%{q}%")
+            Project.project_title.ilike(f"%{q}%")
+            | Project.beneficiary_name.ilike(f"%{q}%")
         )
 
     # Total count
     count_query = select(func.count(Project.id))
     if q:
         count_query = count_query.where(
-            Project.project["project_title"].astext.ilike(f"%{q}%")
-            | Project.beneficiary["name"].astext.ilike(f"%{q}%")
+            Project.project_title.ilike(f"%{q}%")
+            | Project.beneficiary_name.ilike(f"%{q}%")
         )
     total = await session.scalar(count_query) or 0
 
@@ -104,9 +104,9 @@ async def list_projects(
         data.append(
             ProjectListItem(
                 project_id=p.id,
-                project_title=p.project.get("project_title", ""),
-                file_reference=p.project.get("file_reference"),
-                beneficiary_name=p.beneficiary.get("name", ""),
+                project_title=p.project_title or "",
+                file_reference=p.file_reference,
+                beneficiary_name=p.beneficiary_name or "",
                 beneficiary=p.beneficiary,
                 ruleset_id_hint=p.ruleset_id_hint,
                 is_active=p.is_active,
@@ -219,11 +219,13 @@ async def retrieve_rag_examples(
         return RagRetrieveResponse(matches=[])
 
     # Ähnliche Rechnungen suchen
-    search_results = vectorstore.find_similar_invoices(
+    search_results = await vectorstore.afind_similar_invoices(
         raw_text=search_text,
         extracted_data={},
         n_results=data.top_k,
         ruleset_id=payload.ruleset_id,
+        # Nur IDs und Scores werden gebraucht
+        include_documents=False,
     )
 
     # Matches erstellen und Usage in DB aktualisieren
@@ -267,14 +269,14 @@ async def search_rag(data: RagSearchRequest) -> RagSearchResponse:
     matches: list[RagSearchMatch] = []
 
     if data.collection_type == "invoices":
-        results = vectorstore.find_similar_invoices(
+        results = await vectorstore.afind_similar_invoices(
             raw_text=data.query,
             extracted_data={},
             n_results=data.n_results,
             ruleset_id=data.ruleset_id,
         )
     elif data.collection_type == "errors":
-        results = vectorstore.find_similar_errors(
+        results = await vectorstore.afind_similar_errors(
             error_type="",
             feature_id="",
             context_text=data.query,
@@ -282,7 +284,7 @@ async def search_rag(data: RagSearchRequest) -> RagSearchResponse:
             ruleset_id=data.ruleset_id,
         )
     elif data.collection_type == "patterns":
-        results = vectorstore.find_matching_patterns(
+        results = await vectorstore.afind_matching_patterns(
             text=data.query,
             n_results=data.n_results,
         )
@@ -311,7 +313,7 @@ async def get_rag_stats() -> RagStatsResponse:
         Collection-Statistiken.
     """
     rag_service = get_rag_service()
-    stats = rag_service.get_stats()
+    stats = await rag_service.aget_stats()
 
     total = sum(stats.get("collections", {}).values())
 
@@ -5,6 +5,7 @@ FlowAudit Ruleset Samples API
 Endpoints für Musterdokumente von Regelwerken.
 """
 
+import asyncio
 import hashlib
 import logging
 from datetime import datetime
@@ -14,7 +15,9 @@ from uuid import uuid4
 import aiofiles
 from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, UploadFile, status
 from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 from app.config import get_settings
 from app.database import get_async_session
@@ -94,7 +97,7 @@ async def upload_sample(
 
     # Datei lesen und Hash berechnen
     content = await file.read()
-    sha256 = hashlib.sha256(content).hexdigest()
+    sha256 = hashlib.sha256(content).digest()
 
     # Duplikat-Check
     existing = await session.execute(
@@ -133,10 +136,22 @@ async def upload_sample(
         mime_type=file.content_type or "application/pdf",
         description=description,
         status=SampleStatus.PROCESSING,
+        parse_error=None,
     )
 
     session.add(sample)
-    await session.flush()
+    try:
+        await session.flush()
+    except IntegrityError as e:
+        await session.rollback()
+        # Race Condition: gleiche Datei parallel hochgeladen
+        if "uq_ruleset_sample_hash" in str(e):
+            storage_path.unlink(missing_ok=True)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Sample with same content already exists",
+            ) from None
+        raise
 
     # Automatisch parsen
     try:
@@ -259,10 +274,12 @@ async def get_sample(
         Sample-Details mit extrahierten Daten und Ground Truth.
     """
     result = await session.execute(
-        select(RulesetSample).where(
+        select(RulesetSample)
+        .where(
             RulesetSample.id == sample_id,
             RulesetSample.ruleset_id == ruleset_id,
         )
+        .options(undefer(RulesetSample.parse_error))
     )
     sample = result.scalar_one_or_none()
 
@@ -320,10 +337,12 @@ async def update_sample(
         )
 
     result = await session.execute(
-        select(RulesetSample).where(
+        select(RulesetSample)
+        .where(
             RulesetSample.id == sample_id,
             RulesetSample.ruleset_id == ruleset_id,
         )
+        .options(undefer(RulesetSample.parse_error))
     )
     sample = result.scalar_one_or_none()
 
@@ -392,10 +411,12 @@ async def approve_sample(
         )
 
     result = await session.execute(
-        select(RulesetSample).where(
+        select(RulesetSample)
+        .where(
             RulesetSample.id == sample_id,
             RulesetSample.ruleset_id == ruleset_id,
         )
+        .options(undefer(RulesetSample.raw_text), undefer(RulesetSample.parse_error))
     )
     sample = result.scalar_one_or_none()
 
@@ -433,7 +454,8 @@ async def approve_sample(
 
         # Sample als Invoice-Beispiel hinzufügen
         example_id = f"sample_{sample.id}"
-        vectorstore.add_invoice_example(
+        await asyncio.to_thread(
+            vectorstore.add_invoice_example,
             document_id=example_id,
             raw_text=sample.raw_text or "",
             extracted_data=sample.ground_truth or {},
@@ -500,10 +522,12 @@ async def reject_sample(
         )
 
     result = await session.execute(
-        select(RulesetSample).where(
+        select(RulesetSample)
+        .where(
             RulesetSample.id == sample_id,
             RulesetSample.ruleset_id == ruleset_id,
         )
+        .options(undefer(RulesetSample.parse_error))
     )
     sample = result.scalar_one_or_none()
 
@@ -580,7 +604,7 @@ async def delete_sample(
         try:
             vectorstore = get_vectorstore()
             for example_id in sample.rag_example_ids:
-                vectorstore.delete_invoice_example(example_id)
+                await asyncio.to_thread(vectorstore.delete_invoice_example, example_id)
             logger.info(f"Deleted {len(sample.rag_example_ids)} RAG examples for sample {sample_id}")
         except Exception as e:
             logger.warning(f"Error deleting RAG examples for sample {sample_id}: {e}")
@@ -10,6 +10,7 @@ from typing import Any
 from fastapi import APIRouter, Depends, Header, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
 
 from app.database import get_async_session
 from app.models.ruleset import Ruleset
@@ -70,7 +71,9 @@ async def get_ruleset(
     Returns:
         Vollständiges Ruleset mit Features.
     """
-    query = select(Ruleset).where(Ruleset.ruleset_id == ruleset_id)
+    query = select(Ruleset).where(Ruleset.ruleset_id == ruleset_id).options(
+        undefer_group("payload")
+    )
 
     if version:
         query = query.where(Ruleset.version == version)
@@ -179,7 +182,9 @@ async def get_ruleset_llm_schema(
     Returns:
         LLM-Schema mit Prompts und Response-Format.
     """
-    query = select(Ruleset).where(Ruleset.ruleset_id == ruleset_id)
+    query = select(Ruleset).where(Ruleset.ruleset_id == ruleset_id).options(
+        undefer_group("payload")
+    )
 
     if version:
         query = query.where(Ruleset.version == version)
@@ -15,6 +15,7 @@ from app.config import get_settings
 from app.database import get_async_session
 from app.models.enums import Provider
 from app.models.settings import ApiKey, Setting
+from app.rag import get_loaded_embedding_model
 from app.schemas.settings import (
     ApiKeyResponse,
     ApiKeySet,
@@ -29,6 +30,17 @@ router = APIRouter()
 config = get_settings()
 
 
+def _embedding_dimension() -> int | None:
+    """
+    Dimension des Embedding-Modells.
+
+    Lädt das Modell nicht selbst (das übernimmt der Preload beim Start);
+    None, solange es noch nicht geladen ist.
+    """
+    model = get_loaded_embedding_model()
+    return None if model is None else model.dimension
+
+
 @router.get("/settings")
 async def get_settings_endpoint(
     session: AsyncSession = Depends(get_async_session),
@@ -144,7 +156,7 @@ async def get_settings_endpoint(
                 "name": config.embedding_model.split("/")[-1],
                 "full_name": config.embedding_model,
                 "type": "sentence-transformers",
-                "dimensions": 768,  # paraphrase-multilingual-mpnet-base-v2
+                "dimensions": _embedding_dimension(),
                 "languages": "50+ (inkl. Deutsch)",
                 "description": "Multilinguales Embedding-Modell für semantische Ähnlichkeitssuche",
             },
@@ -216,6 +228,7 @@ async def update_settings(
                 session.add(Setting(key=key, value=value))
 
     await session.commit()
+    Setting.invalidate_cache()
 
     return await get_settings_endpoint(session)
 
@@ -5,6 +5,7 @@ FlowAudit Solution File API
 Endpoints für Lösungsdatei-Import und -Verarbeitung.
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Any
@@ -12,12 +13,13 @@ from typing import Any
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
 from app.database import get_async_session
 from app.models.document import Document
 from app.models.enums import MatchingStrategy, SolutionFileFormat
 from app.models.project import Project
-from app.models.solution import SolutionFile, SolutionMatch
+from app.models.solution import SolutionFile, SolutionFileEntry, SolutionMatch
 from app.schemas.solution import (
     ApplyOptionsSchema,
     AppliedCorrectionSchema,
@@ -27,7 +29,7 @@ from app.schemas.solution import (
     SolutionFileUploadResponse,
     SolutionPreviewResponse,
 )
-from app.rag.vectorstore import get_vectorstore
+from app.rag.vectorstore import ErrorExampleSpec, get_vectorstore
 from app.services.solution_matcher import DocumentInfo, SolutionMatcher
 from app.services.solution_parser import SolutionFileParser
 
@@ -105,9 +107,15 @@ async def upload_solution_file(
         valid_count=parsed.valid_count,
         invalid_count=parsed.invalid_count,
         error_count=parsed.error_count,
-        entries=[e.to_dict() for e in parsed.entries],
     )
     session.add(solution_file)
+    await session.flush()
+
+    # Einträge gesammelt in die Kind-Tabelle schreiben
+    await SolutionFileEntry.bulk_create(
+        session,
+        [{"solution_file_id": solution_file.id, **e.to_dict()} for e in parsed.entries],
+    )
     await session.commit()
 
     logger.info(
@@ -190,10 +198,12 @@ async def preview_solution_matching(
     """
     # Lösungsdatei laden
     result = await session.execute(
-        select(SolutionFile).where(
+        select(SolutionFile)
+        .where(
             SolutionFile.id == solution_file_id,
             SolutionFile.project_id == project_id,
         )
+        .options(selectinload(SolutionFile.entries))
     )
     solution_file = result.scalar_one_or_none()
     if not solution_file:
@@ -230,7 +240,7 @@ async def preview_solution_matching(
     # Lösungsdatei rekonstruieren
     from app.services.solution_parser import ParsedSolutionFile, SolutionEntry
 
-    entries = [SolutionEntry.from_dict(e) for e in solution_file.entries]
+    entries = [SolutionEntry.from_dict(e.to_dict()) for e in solution_file.entries]
     parsed = ParsedSolutionFile(
         format=SolutionFileFormat(solution_file.format),
         entries=entries,
@@ -310,10 +320,12 @@ async def apply_solution_file(
 
     # Lösungsdatei laden
     result = await session.execute(
-        select(SolutionFile).where(
+        select(SolutionFile)
+        .where(
             SolutionFile.id == solution_file_id,
             SolutionFile.project_id == project_id,
         )
+        .options(selectinload(SolutionFile.entries))
     )
     solution_file = result.scalar_one_or_none()
     if not solution_file:
@@ -357,7 +369,12 @@ async def apply_solution_file(
     # Lösungsdatei rekonstruieren
     from app.services.solution_parser import ParsedSolutionFile, SolutionEntry
 
-    entries = [SolutionEntry.from_dict(e) for e in solution_file.entries]
+    entries = [SolutionEntry.from_dict(e.to_dict()) for e in solution_file.entries]
+    # Zeilen-ID je rekonstruiertem Eintrag, nach Objektidentität (Positionen
+    # können sich wiederholen, gleiche Einträge sind gleich, aber nicht identisch)
+    entry_ids = {
+        id(entry): row.id for entry, row in zip(entries, solution_file.entries, strict=True)
+    }
     parsed = ParsedSolutionFile(
         format=SolutionFileFormat(solution_file.format),
         entries=entries,
@@ -374,6 +391,7 @@ async def apply_solution_file(
     skipped_count = 0
     total_rag_examples = 0
     errors: list[str] = []
+    match_rows: list[dict[str, Any]] = []
 
     for match in matching_result.matched:
         # Konfidenz prüfen
@@ -382,24 +400,24 @@ async def apply_solution_file(
             continue
 
         try:
-            # SolutionMatch erstellen
-            solution_match = SolutionMatch(
-                solution_file_id=solution_file_id,
-                document_id=match.document_id,
-                solution_position=match.solution_entry.position,
-                solution_filename=match.solution_entry.filename,
-                match_confidence=match.match_confidence,
-                match_reason=match.match_reason,
-                strategy_used=match.strategy_used.value,
-                is_valid=match.solution_entry.is_valid,
-                errors=[e.to_dict() for e in match.solution_entry.errors],
-                fields=match.solution_entry.fields,
-                applied=True,
-                applied_at=datetime.utcnow(),
-                errors_applied=len(match.solution_entry.errors),
-                fields_updated=len(match.solution_entry.fields),
-            )
-            session.add(solution_match)
+            # SolutionMatch-Zeile vormerken (gesammelter INSERT nach der Schleife)
+            match_row = {
+                "solution_file_id": solution_file_id,
+                "document_id": match.document_id,
+                "solution_entry_id": entry_ids[id(match.solution_entry)],
+                "solution_position": match.solution_entry.position,
+                "match_confidence": SolutionMatch.quantize_confidence(match.match_confidence),
+                "match_reason": match.match_reason,
+                "strategy_used": match.strategy_used.value,
+                "is_valid": match.solution_entry.is_valid,
+                "errors": [e.to_dict() for e in match.solution_entry.errors],
+                "fields": match.solution_entry.fields,
+                "applied": True,
+                "applied_at": datetime.utcnow(),
+                "errors_applied": len(match.solution_entry.errors),
+                "fields_updated": len(match.solution_entry.fields),
+                "rag_examples_created": 0,
+            }
 
             # RAG-Beispiele erstellen (wenn aktiviert und Fehler vorhanden)
             rag_created = 0
@@ -419,10 +437,9 @@ async def apply_solution_file(
                                 raw_text = pr.raw_text
                                 break
 
-                    for error in match.solution_entry.errors:
-                        error_id = f"solution_{solution_file_id}_{match.document_id}_{error.feature_id}"
-                        vectorstore.add_error_example(
-                            error_id=error_id,
+                    error_examples = [
+                        ErrorExampleSpec(
+                            error_id=f"solution_{solution_file_id}_{match.document_id}_{error.feature_id}",
                             error_type=error.error_type,
                             feature_id=error.feature_id,
                             context_text=raw_text[:2000] if raw_text else "",
@@ -431,13 +448,18 @@ async def apply_solution_file(
                             reasoning=error.message or "",
                             ruleset_id=match.solution_entry.ruleset_id or "DE_USTG",
                         )
-                        rag_created += 1
+                        for error in match.solution_entry.errors
+                    ]
+                    await asyncio.to_thread(vectorstore.add_error_examples, error_examples)
+                    rag_created += len(error_examples)
                 except Exception as e:
                     logger.warning(f"Fehler beim Erstellen von RAG-Beispielen: {e}")
 
-                solution_match.rag_examples_created = rag_created
+                match_row["rag_examples_created"] = rag_created
                 total_rag_examples += rag_created
 
+            match_rows.append(match_row)
+
             corrections.append(
                 AppliedCorrectionSchema(
                     document_id=match.document_id,
@@ -455,6 +477,8 @@ async def apply_solution_file(
             errors.append(f"{match.document_filename}: {e}")
             skipped_count += 1
 
+    await SolutionMatch.bulk_create(session, match_rows)
+
     # Lösungsdatei als angewendet markieren
     solution_file.applied = True
     solution_file.applied_at = datetime.utcnow()
@@ -487,6 +511,8 @@ async def apply_solution_file(
 async def get_solution_file(
     project_id: str,
     solution_file_id: str,
+    entries_offset: int = Query(default=0, ge=0),
+    entries_limit: int | None = Query(default=None, ge=1, le=1000),
     session: AsyncSession = Depends(get_async_session),
 ) -> dict[str, Any]:
     """
@@ -495,6 +521,8 @@ async def get_solution_file(
     Args:
         project_id: Projekt-ID
         solution_file_id: Lösungsdatei-ID
+        entries_offset: Erster zurückgegebener Eintrag
+        entries_limit: Max. Anzahl Einträge (ohne Angabe alle)
 
     Returns:
         Lösungsdatei-Details
@@ -512,6 +540,17 @@ async def get_solution_file(
             detail="Lösungsdatei nicht gefunden",
         )
 
+    # Nur die angefragte Seite der Einträge laden
+    entries_query = (
+        select(SolutionFileEntry)
+        .where(SolutionFileEntry.solution_file_id == solution_file_id)
+        .order_by(SolutionFileEntry.position, SolutionFileEntry.id)
+        .offset(entries_offset)
+    )
+    if entries_limit is not None:
+        entries_query = entries_query.limit(entries_limit)
+    entries = (await session.scalars(entries_query)).all()
+
     return {
         "id": solution_file.id,
         "project_id": solution_file.project_id,
@@ -530,7 +569,7 @@ async def get_solution_file(
         "skipped_count": solution_file.skipped_count,
         "rag_examples_created": solution_file.rag_examples_created,
         "created_at": solution_file.created_at,
-        "entries": solution_file.entries,
+        "entries": [e.to_dict() for e in entries],
     }
 
 
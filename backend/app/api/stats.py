@@ -11,6 +11,7 @@ from typing import Any
 from fastapi import APIRouter, Depends
 from sqlalchemy import Integer, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
 from app.api.deps import CurrentAdmin
 from app.database import get_async_session
@@ -48,7 +49,10 @@ async def get_feature_names(
 
     # Zuerst aus Datenbank lesen
     db_result = await session.execute(
-        select(Ruleset).where(Ruleset.ruleset_id == ruleset_id).order_by(Ruleset.version.desc())
+        select(Ruleset)
+        .where(Ruleset.ruleset_id == ruleset_id)
+        .order_by(Ruleset.version.desc())
+        .options(undefer(Ruleset.features))
     )
     db_ruleset = db_result.scalar_one_or_none()
 
@@ -111,7 +115,7 @@ async def get_all_feature_names(
         result[ruleset_id] = ruleset_features
 
     # Dann Datenbank-Regelwerke hinzufügen/überschreiben
-    db_result = await session.execute(select(Ruleset))
+    db_result = await session.execute(select(Ruleset).options(undefer(Ruleset.features)))
     db_rulesets = db_result.scalars().all()
 
     for db_ruleset in db_rulesets:
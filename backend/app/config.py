@@ -47,6 +47,7 @@ class Settings(BaseSettings):
     )
     database_pool_size: int = 5
     database_max_overflow: int = 10
+    database_pool_recycle: int = 1800  # Sekunden
 
     # Redis
     redis_url: str = Field(default="redis://localhost:6379/0")
@@ -99,9 +100,48 @@ class Settings(BaseSettings):
     rag_max_examples: int = 3  # Maximale Anzahl Beispiele (1-5)
     rag_same_document_type: bool = True  # Nur Beispiele vom gleichen Dokumenttyp
     rag_same_ruleset: bool = True  # Nur Beispiele vom gleichen Ruleset
+    # Semantischer Cache für RAG-Kontexte (0 = deaktiviert)
+    rag_semantic_cache_size: int = 256
+    rag_semantic_cache_threshold: float = 0.97
+    rag_semantic_cache_ttl: int = 300  # Sekunden; Lernen in anderen Prozessen
     # Multilingual embedding model for German invoice texts
-    # Supports 50+ languages including German, 768 dimensions
-    embedding_model: str = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+    # Distilled MiniLM (12 layers, 384 dimensions), 50+ languages including German.
+    # Changing the model changes the dimension: existing Chroma collections
+    # must be rebuilt.
+    embedding_model: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    # Obergrenze für Tokens pro Text (längere Eingaben werden abgeschnitten)
+    embedding_max_seq_length: int = 256
+    # Inferenz-Backend: "torch" (FP32), "onnx" (ONNX Runtime, INT8-quantisiert)
+    # oder "tensorrt" (ONNX Runtime mit TensorRT, FP16, nur NVIDIA-GPU)
+    embedding_backend: str = "torch"
+    # ONNX-Datei im Modell-Repository (dynamisch quantisiert, AVX512-VNNI)
+    embedding_onnx_file: str = "onnx/model_qint8_avx512_vnni.onnx"
+    # Unquantisierte ONNX-Datei als Eingabe für TensorRT
+    embedding_trt_onnx_file: str = "onnx/model.onnx"
+    # Cache für gebaute TensorRT-Engines (relativ zu storage_path)
+    embedding_trt_cache_dir: str = "trt_cache"
+    # Gerät (None = automatisch: CUDA falls verfügbar, sonst CPU)
+    embedding_device: str | None = None
+    # FP16-Gewichte auf CUDA (nur torch-Backend)
+    embedding_half_precision: bool = False
+    # Modell beim ersten Zugriff auf den Singleton laden und aufwärmen
+    embedding_warmup: bool = True
+    # Modell schon beim API-Start laden statt beim ersten Request
+    embedding_preload: bool = True
+    # Embedding-Cache nach Text-Hash: Einträge im Speicher (0 = aus) und
+    # optional persistent in einer SQLite-Datei unter storage_path (höchstens
+    # embedding_cache_max_rows Einträge, älteste zuerst verdrängt; bei 384
+    # Dimensionen rund 1,5 KB pro Eintrag)
+    embedding_cache_size: int = 4096
+    embedding_cache_persist: bool = True
+    embedding_cache_max_rows: int = 50_000
+    embedding_cache_file: str = "embedding_cache.sqlite3"
+    # Fuzzy-Cache für Rechnungs-Suchanfragen (nie beim Speichern): fast
+    # gleiche Texte (SimHash, höchstens embedding_fuzzy_max_distance
+    # abweichende Bits) nutzen das vorhandene Embedding. Standardmäßig aus,
+    # da der Vektor nur angenähert ist.
+    embedding_fuzzy_cache: bool = False
+    embedding_fuzzy_max_distance: int = 4
 
     # Parser settings
     parser_timeout_sec: int = 30
@@ -173,6 +213,16 @@ class Settings(BaseSettings):
         """Vollständiger Pfad für Logs."""
         return self.storage_path / self.logs_dir
 
+    @property
+    def embedding_cache_path(self) -> Path:
+        """Vollständiger Pfad der persistenten Embedding-Cache-Datei."""
+        return self.storage_path / self.embedding_cache_file
+
+    @property
+    def embedding_trt_cache_path(self) -> Path:
+        """Vollständiger Pfad für den TensorRT-Engine-Cache."""
+        return self.storage_path / self.embedding_trt_cache_dir
+
     @property
     def cors_origins_list(self) -> list[str]:
         """Liste der erlaubten CORS-Origins."""
@@ -8,10 +8,13 @@ Verwendet asyncpg als async Treiber.
 
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
-from typing import Annotated
+from typing import Annotated, Any
 
+import orjson
 from fastapi import Depends
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
@@ -29,13 +32,31 @@ class Base(DeclarativeBase):
     pass
 
 
+def json_serializer(obj: Any) -> str:
+    """
+    Serialisiert JSON/JSONB-Spaltenwerte mit orjson.
+
+    OPT_NON_STR_KEYS hält die Kompatibilität zu json.dumps, das
+    Nicht-String-Keys (z.B. int) ebenfalls in Strings umwandelt.
+    """
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def json_deserializer(data: str | bytes) -> Any:
+    """Deserialisiert JSON/JSONB-Spaltenwerte mit orjson."""
+    return orjson.loads(data)
+
+
 # Async Engine erstellen
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     pool_size=settings.database_pool_size,
     max_overflow=settings.database_max_overflow,
+    pool_recycle=settings.database_pool_recycle,
     pool_pre_ping=True,
+    json_serializer=json_serializer,
+    json_deserializer=json_deserializer,
 )
 
 # Async Session Factory
@@ -89,6 +110,37 @@ async def get_session_context() -> AsyncGenerator[AsyncSession, None]:
 AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
 
 
+# Trigger-Funktion: updated_at auch bei Updates außerhalb des ORM setzen
+SET_UPDATED_AT_FUNCTION = """
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+async def install_updated_at_triggers(conn: AsyncConnection) -> None:
+    """
+    Legt den updated_at-Trigger für alle Tabellen mit updated_at-Spalte an.
+
+    Args:
+        conn: Offene Verbindung (innerhalb einer Transaktion)
+    """
+    await conn.execute(text(SET_UPDATED_AT_FUNCTION))
+    for table in Base.metadata.tables.values():
+        if "updated_at" not in table.columns:
+            continue
+        await conn.execute(
+            text(
+                f"CREATE OR REPLACE TRIGGER trg_{table.name}_updated_at "
+                f"BEFORE UPDATE ON {table.name} "
+                "FOR EACH ROW EXECUTE FUNCTION set_updated_at()"
+            )
+        )
+
+
 async def init_db() -> None:
     """
     Initialisiert die Datenbank.
@@ -98,6 +150,7 @@ async def init_db() -> None:
     """
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await install_updated_at_triggers(conn)
 
 
 async def close_db() -> None:
@@ -14,6 +14,7 @@ from typing import Any
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer_group
 
 from app.models.enums import Provider
 from app.models.ruleset import Ruleset
@@ -269,6 +270,7 @@ class LLMAdapter:
             select(Ruleset)
             .where(Ruleset.ruleset_id == ruleset_id)
             .order_by(Ruleset.version.desc())
+            .options(undefer_group("payload"))
         )
         ruleset = result.scalar_one_or_none()
 
@@ -5,6 +5,7 @@ FlowAudit FastAPI Application
 Haupteinstiegspunkt für die Backend-API.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from datetime import UTC, datetime
@@ -39,6 +40,7 @@ from app.api import (
 )
 from app.config import get_settings
 from app.database import close_db, get_session_context, init_db
+from app.rag import get_embedding_model
 from app.seeds import seed_rulesets
 
 # Logging konfigurieren
@@ -51,6 +53,15 @@ logger = logging.getLogger(__name__)
 config = get_settings()
 
 
+async def _preload_embedding_model() -> None:
+    """Lädt das Embedding-Modell im Hintergrund (blockiert den Start nicht)."""
+    try:
+        await asyncio.to_thread(get_embedding_model)
+        logger.info("Embedding model preloaded")
+    except Exception as e:
+        logger.warning(f"Could not preload embedding model: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
@@ -83,8 +94,17 @@ async def lifespan(app: FastAPI):
         path.mkdir(parents=True, exist_ok=True)
     logger.info("Storage directories created")
 
+    # Embedding-Modell im Hintergrund vorladen: die API nimmt sofort
+    # Requests an, der erste RAG-Request wartet höchstens auf den Rest
+    preload_task = (
+        asyncio.create_task(_preload_embedding_model()) if config.embedding_preload else None
+    )
+
     yield
 
+    if preload_task is not None and not preload_task.done():
+        preload_task.cancel()
+
     # Cleanup
     await close_db()
     logger.info("FlowAudit Backend shutdown complete")
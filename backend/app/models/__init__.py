@@ -17,7 +17,7 @@ from app.models.ruleset import Ruleset
 from app.models.ruleset_checker import RulesetCheckerSettings
 from app.models.ruleset_sample import RulesetSample
 from app.models.settings import ApiKey, Setting
-from app.models.solution import SolutionFile, SolutionMatch
+from app.models.solution import SolutionFile, SolutionFileEntry, SolutionMatch
 from app.models.document_type import DocumentTypeSettings
 from app.models.training import ModelRegistry, TrainingDataset, TrainingExample, TrainingRun
 from app.models.user import User
@@ -58,6 +58,7 @@ __all__ = [
     "GeneratorJob",
     # Solution Files
     "SolutionFile",
+    "SolutionFileEntry",
     "SolutionMatch",
     # Audit
     "AuditEvent",
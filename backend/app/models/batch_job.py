@@ -4,11 +4,11 @@ BatchJob Model
 Model für die Verwaltung von Batch-Jobs für Massenverarbeitung.
 """
 
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import Any, Optional
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, Enum, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Enum, Float, ForeignKey, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -91,7 +91,7 @@ class BatchJob(Base):
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
+        server_default=func.now(),
     )
     started_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True),
@@ -150,7 +150,7 @@ class BatchJob(Base):
         """Berechnet die Laufzeit in Sekunden."""
         if not self.started_at:
             return None
-        end_time = self.completed_at or datetime.utcnow()
+        end_time = self.completed_at or datetime.now(UTC)
         return (end_time - self.started_at).total_seconds()
 
     def update_progress(
@@ -176,12 +176,12 @@ class BatchJob(Base):
     def mark_started(self) -> None:
         """Markiert den Job als gestartet."""
         self.status = BatchJobStatus.RUNNING.value
-        self.started_at = datetime.utcnow()
+        self.started_at = datetime.now(UTC)
 
     def mark_completed(self, results: Optional[dict] = None) -> None:
         """Markiert den Job als abgeschlossen."""
         self.status = BatchJobStatus.COMPLETED.value
-        self.completed_at = datetime.utcnow()
+        self.completed_at = datetime.now(UTC)
         self.progress_percent = 100.0
         if results:
             self.results = results
@@ -189,7 +189,7 @@ class BatchJob(Base):
     def mark_failed(self, error: str, errors: Optional[list] = None) -> None:
         """Markiert den Job als fehlgeschlagen."""
         self.status = BatchJobStatus.FAILED.value
-        self.completed_at = datetime.utcnow()
+        self.completed_at = datetime.now(UTC)
         self.status_message = error
         if errors:
             self.errors = errors
@@ -197,7 +197,7 @@ class BatchJob(Base):
     def mark_cancelled(self) -> None:
         """Markiert den Job als abgebrochen."""
         self.status = BatchJobStatus.CANCELLED.value
-        self.completed_at = datetime.utcnow()
+        self.completed_at = datetime.now(UTC)
         self.status_message = "Job wurde abgebrochen"
 
     def add_error(self, error: str, item_id: Optional[str] = None) -> None:
@@ -206,7 +206,7 @@ class BatchJob(Base):
         self.errors.append({
             "message": error,
             "item_id": item_id,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(UTC).isoformat(),
         })
 
     def add_warning(self, warning: str, item_id: Optional[str] = None) -> None:
@@ -215,5 +215,5 @@ class BatchJob(Base):
         self.warnings.append({
             "message": warning,
             "item_id": item_id,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": datetime.now(UTC).isoformat(),
         })
@@ -5,16 +5,19 @@ Model für benutzerdefinierte Prüfkriterien.
 """
 
 from datetime import datetime
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 from app.models.enums import CriterionLogicType
 
+if TYPE_CHECKING:
+    from app.models.project import Project
+
 
 class CustomCriterion(Base):
     """
@@ -29,6 +32,8 @@ class CustomCriterion(Base):
     """
 
     __tablename__ = "custom_criteria"
+    # updated_at nach UPDATE per RETURNING nachladen
+    __mapper_args__ = {"eager_defaults": True}
 
     # Primary Key
     id: Mapped[str] = mapped_column(
@@ -90,16 +95,18 @@ class CustomCriterion(Base):
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
+        server_default=func.now(),
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        server_default=func.now(),
+        onupdate=func.now(),
     )
 
     # Relationships
-    project = relationship("Project", backref="custom_criteria")
+    project: Mapped["Project | None"] = relationship(
+        "Project", back_populates="custom_criteria", lazy="raise"
+    )
 
     def __repr__(self) -> str:
         return f"<CustomCriterion {self.name} ({self.error_code})>"
@@ -164,6 +164,23 @@ class JobStatus(str, Enum):
     FAILED = "FAILED"
 
 
+class ResultStatus(str, Enum):
+    """Status eines finalen Prüfergebnisses."""
+
+    PENDING = "PENDING"
+    REVIEW_PENDING = "REVIEW_PENDING"
+    ACCEPTED = "ACCEPTED"
+    REJECTED = "REJECTED"
+
+
+class TrafficLight(str, Enum):
+    """Ampel-Bewertung eines Prüfergebnisses."""
+
+    GREEN = "GREEN"
+    YELLOW = "YELLOW"
+    RED = "RED"
+
+
 class ExportFormat(str, Enum):
     """Export-Formate."""
 
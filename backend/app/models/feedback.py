@@ -5,11 +5,11 @@ FlowAudit Feedback and RAG Example Models
 Human-in-the-loop Feedback und RAG-Beispiele für Few-Shot-Learning.
 """
 
-from datetime import datetime
+from datetime import UTC, datetime
 from typing import TYPE_CHECKING, Any
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Enum, ForeignKey, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -66,7 +66,7 @@ class Feedback(Base):
 
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now()
     )
 
     # Relationships
@@ -151,7 +151,7 @@ class RagExample(Base):
 
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now()
     )
 
     # Relationships
@@ -166,4 +166,4 @@ class RagExample(Base):
     def increment_usage(self) -> None:
         """Erhöht Nutzungszähler."""
         self.usage_count += 1
-        self.last_used_at = datetime.utcnow()
+        self.last_used_at = datetime.now(UTC)
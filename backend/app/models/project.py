@@ -5,21 +5,80 @@ FlowAudit Project Model
 Vorhaben/Projekt mit Begünstigtem und Durchführungsort.
 """
 
+import hmac
 import secrets
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
-from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String
+from sqlalchemy import (
+    Boolean,
+    Computed,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    String,
+    Text,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy.orm import Mapped, mapped_column, reconstructor, relationship, validates
 
 from app.database import Base
+from app.models.project_share import hash_share_token
 
 if TYPE_CHECKING:
     from app.models.document import Document
     from app.models.user import User
     from app.models.batch_job import BatchJob
+    from app.models.custom_criterion import CustomCriterion
+    from app.models.solution import SolutionFile
+
+
+@dataclass(slots=True, frozen=True)
+class PostalAddress:
+    """
+    Lesende Sicht auf einen Adressblock aus dem Projekt-JSONB.
+
+    Wird einmal pro Instanz aus dem JSON erzeugt; danach erfolgen Zugriffe
+    per Attribut statt über wiederholte dict.get()-Ketten.
+    """
+
+    name: str = ""
+    street: str = ""
+    zip: str = ""
+    city: str = ""
+    country: str = ""
+    # Einzeilige Adresse, in __post_init__ vorberechnet
+    full: str = field(init=False, default="", compare=False)
+
+    def __post_init__(self) -> None:
+        city_line = f"{self.zip} {self.city}".strip()
+        parts = (self.name, self.street, city_line, self.country)
+        object.__setattr__(self, "full", ", ".join(p for p in parts if p))
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any], name_key: str = "name") -> "PostalAddress":
+        """
+        Erzeugt die Adresse aus einem JSON-Block.
+
+        Args:
+            data: JSON mit name/location_name, street, zip, city, country.
+            name_key: Schlüssel für die Bezeichnung ("name" oder "location_name").
+
+        Returns:
+            PostalAddress (fehlende Werte als Leerstring).
+        """
+        return cls(
+            name=data.get(name_key) or "",
+            street=data.get("street") or "",
+            zip=str(data.get("zip") or ""),
+            city=data.get("city") or "",
+            country=data.get("country") or "",
+        )
 
 
 class Project(Base):
@@ -31,12 +90,35 @@ class Project(Base):
     - Projekt-Details mit Durchführungsort (implementation)
     - Zeitraum und Budget
     - Besitzer und Nutzer-Zuweisungen
+
+    Ladestrategien:
+    - owner wird per JOIN mitgeladen (many-to-one, eine Zeile).
+    - documents, batch_jobs und assigned_users sind lazy="raise": Endpoints,
+      die sie brauchen, laden explizit mit
+      ``select(Project).options(selectinload(Project.documents))``.
+      Löschen überlässt die Kaskade der Datenbank (passive_deletes).
     """
 
     __tablename__ = "projects"
+    __table_args__ = (
+        # B-tree-Indizes für Punkt-Lookups auf die heißen JSONB-Skalare
+        Index(
+            "idx_projects_vat_id",
+            "beneficiary_vat_id",
+            postgresql_where=text("beneficiary_vat_id IS NOT NULL"),
+        ),
+        Index("idx_projects_title", "project_title"),
+        Index(
+            "idx_projects_file_ref",
+            "file_reference",
+            postgresql_where=text("file_reference IS NOT NULL"),
+        ),
+    )
+    # Generierte Spalten nach INSERT/UPDATE per RETURNING nachladen
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4())
+        UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()")
     )
 
     # Ruleset-Hinweis
@@ -49,6 +131,24 @@ class Project(Base):
     # Projekt-Details (JSON mit project_title, implementation, budget, period, etc.)
     project: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
 
+    # Aus JSONB generierte Spalten (Postgres GENERATED ALWAYS ... STORED).
+    # Schreibzugriffe laufen weiterhin nur über beneficiary/project.
+    project_title: Mapped[str | None] = mapped_column(
+        Text, Computed("project->>'project_title'", persisted=True)
+    )
+    file_reference: Mapped[str | None] = mapped_column(
+        Text, Computed("project->>'file_reference'", persisted=True)
+    )
+    funding_rate_percent: Mapped[float | None] = mapped_column(
+        Float, Computed("(project->>'funding_rate_percent')::double precision", persisted=True)
+    )
+    beneficiary_name: Mapped[str | None] = mapped_column(
+        Text, Computed("beneficiary->>'name'", persisted=True)
+    )
+    beneficiary_vat_id: Mapped[str | None] = mapped_column(
+        Text, Computed("beneficiary->>'vat_id'", persisted=True)
+    )
+
     # Status
     is_active: Mapped[bool] = mapped_column(Boolean, default=False)
 
@@ -61,6 +161,7 @@ class Project(Base):
     owner: Mapped["User | None"] = relationship(
         "User",
         foreign_keys=[owner_id],
+        lazy="joined",
     )
 
     # Nutzer, die diesem Projekt zugewiesen sind (Schüler)
@@ -68,6 +169,8 @@ class Project(Base):
         "User",
         back_populates="assigned_project",
         foreign_keys="User.assigned_project_id",
+        lazy="raise",
+        passive_deletes=True,
     )
 
     # Externe Freigabe
@@ -76,66 +179,135 @@ class Project(Base):
         default=False,
         nullable=False,
     )
-    share_token: Mapped[str | None] = mapped_column(
-        String(64),
+    # Nur der SHA-256 des Tokens wird gespeichert
+    share_token_hash: Mapped[bytes | None] = mapped_column(
+        LargeBinary(32),
         unique=True,
         nullable=True,
+        index=True,
     )
 
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
     # Relationships
     documents: Mapped[list["Document"]] = relationship(
-        "Document", back_populates="project", cascade="all, delete-orphan"
+        "Document",
+        back_populates="project",
+        cascade="all, delete-orphan",
+        lazy="raise",
+        passive_deletes=True,
     )
     batch_jobs: Mapped[list["BatchJob"]] = relationship(
-        "BatchJob", back_populates="project", cascade="all, delete-orphan"
+        "BatchJob",
+        back_populates="project",
+        cascade="all, delete-orphan",
+        lazy="raise",
+        passive_deletes=True,
+    )
+    solution_files: Mapped[list["SolutionFile"]] = relationship(
+        "SolutionFile",
+        back_populates="project",
+        lazy="raise",
+        passive_deletes=True,
     )
+    custom_criteria: Mapped[list["CustomCriterion"]] = relationship(
+        "CustomCriterion",
+        back_populates="project",
+        lazy="raise",
+        passive_deletes=True,
+    )
+
+    # Nicht gemappte Instanz-Caches mit Typ-Annotation zulassen
+    __allow_unmapped__ = True
+
+    # Cache für Adress-Sichten (nicht gemappt), Schlüssel "beneficiary"/"implementation"
+    _address_cache: dict[str, PostalAddress | None] | None = None
+    # Aliases als Tuple und casefold-Menge (nicht gemappt)
+    _aliases: tuple[str, ...] | None = None
+    _aliases_ci: frozenset[str] | None = None
+
+    @reconstructor
+    def _init_on_load(self) -> None:
+        """Setzt die Caches nach dem Laden aus der DB zurück."""
+        self._address_cache = None
+        self._aliases = None
+        self._aliases_ci = None
+
+    @validates("beneficiary", "project")
+    def _validate_payload(self, key: str, value: dict[str, Any]) -> dict[str, Any]:
+        """Invalidiert die gecachten Adressen bei Neuzuweisung der JSONB-Blöcke."""
+        if self._address_cache is not None:
+            cache_key = "beneficiary" if key == "beneficiary" else "implementation"
+            self._address_cache.pop(cache_key, None)
+        if key == "beneficiary":
+            self._aliases = None
+            self._aliases_ci = None
+        return value
 
     def generate_share_token(self) -> str:
-        """Generiert ein neues Share-Token für externe Freigabe."""
-        self.share_token = secrets.token_urlsafe(48)
+        """
+        Generiert ein neues Share-Token für externe Freigabe.
+
+        Returns:
+            Klartext-Token. Gespeichert wird nur dessen Hash.
+        """
+        token = secrets.token_urlsafe(48)
+        self.share_token_hash = hash_share_token(token)
         self.is_shared_externally = True
-        return self.share_token
+        return token
+
+    def verify_share_token(self, provided: str) -> bool:
+        """
+        Prüft ein übergebenes Share-Token in konstanter Zeit.
+
+        Args:
+            provided: Vom Client übergebenes Token.
+
+        Returns:
+            True wenn das Projekt extern freigegeben ist und das Token passt.
+        """
+        if not self.is_shared_externally or self.share_token_hash is None:
+            return False
+        return hmac.compare_digest(hash_share_token(provided), self.share_token_hash)
 
     def revoke_share_token(self) -> None:
         """Widerruft das Share-Token."""
-        self.share_token = None
+        self.share_token_hash = None
         self.is_shared_externally = False
 
     def __repr__(self) -> str:
         """String-Repräsentation."""
-        title = self.project.get("project_title", "Unbenannt")
+        title = self.project_title or "Unbenannt"
         return f"<Project {title[:30]}>"
 
     @property
-    def project_title(self) -> str:
-        """Projekt-Titel."""
-        title: str = self.project.get("project_title", "")
-        return title
+    def beneficiary_aliases(self) -> tuple[str, ...]:
+        """Alias-Namen des Begünstigten (unveränderliches Tuple)."""
+        if self._aliases is None:
+            self._aliases = tuple(self.beneficiary.get("aliases") or ())
+        return self._aliases
 
-    @property
-    def file_reference(self) -> str | None:
-        """Aktenzeichen."""
-        return self.project.get("file_reference")
+    def matches_alias(self, name: str) -> bool:
+        """
+        Prüft, ob ein Name einem Alias des Begünstigten entspricht.
 
-    @property
-    def beneficiary_name(self) -> str:
-        """Name des Begünstigten."""
-        name: str = self.beneficiary.get("name", "")
-        return name
+        Vergleich ist unabhängig von Groß-/Kleinschreibung (casefold).
 
-    @property
-    def beneficiary_aliases(self) -> list[str]:
-        """Alias-Namen des Begünstigten."""
-        aliases: list[str] = self.beneficiary.get("aliases", [])
-        return aliases
+        Args:
+            name: Zu prüfender Name.
+
+        Returns:
+            True bei exaktem Alias-Treffer.
+        """
+        if self._aliases_ci is None:
+            self._aliases_ci = frozenset(a.casefold() for a in self.beneficiary_aliases)
+        return name.casefold() in self._aliases_ci
 
     @property
     def implementation_location(self) -> dict[str, Any] | None:
@@ -161,20 +333,31 @@ class Project(Base):
         """Projektbeschreibung für semantische Prüfung."""
         return self.project.get("project_description")
 
-    @property
-    def beneficiary_vat_id(self) -> str | None:
-        """USt-IdNr. des Begünstigten für Selbstrechnungs-Prüfung."""
-        return self.beneficiary.get("vat_id")
-
     @property
     def max_funding_amount(self) -> dict[str, Any] | None:
         """Maximale Fördersumme."""
         return self.project.get("max_funding_amount")
 
     @property
-    def funding_rate_percent(self) -> float | None:
-        """Fördersatz in Prozent."""
-        return self.project.get("funding_rate_percent")
+    def beneficiary_address(self) -> PostalAddress:
+        """Adresse des Begünstigten (einmal pro Instanz aus dem JSONB erzeugt)."""
+        cache = self._get_address_cache()
+        address = cache.get("beneficiary")
+        if address is None:
+            address = PostalAddress.from_json(self.beneficiary)
+            cache["beneficiary"] = address
+        return address
+
+    @property
+    def implementation_address(self) -> PostalAddress | None:
+        """Adresse des Durchführungsorts oder None."""
+        cache = self._get_address_cache()
+        if "implementation" not in cache:
+            impl = self.implementation_location
+            cache["implementation"] = (
+                PostalAddress.from_json(impl, name_key="location_name") if impl else None
+            )
+        return cache["implementation"]
 
     def get_beneficiary_full_address(self) -> str:
         """
@@ -183,14 +366,7 @@ class Project(Base):
         Returns:
             Formatierte Adresse.
         """
-        b = self.beneficiary
-        parts = [
-            b.get("name", ""),
-            b.get("street", ""),
-            f"{b.get('zip', '')} {b.get('city', '')}".strip(),
-            b.get("country", ""),
-        ]
-        return ", ".join(filter(None, parts))
+        return self.beneficiary_address.full
 
     def get_implementation_full_address(self) -> str | None:
         """
@@ -199,14 +375,11 @@ class Project(Base):
         Returns:
             Formatierte Adresse oder None.
         """
-        impl = self.implementation_location
-        if not impl:
-            return None
-
-        parts = [
-            impl.get("location_name", ""),
-            impl.get("street", ""),
-            f"{impl.get('zip', '')} {impl.get('city', '')}".strip(),
-            impl.get("country", ""),
-        ]
-        return ", ".join(filter(None, parts))
+        address = self.implementation_address
+        return address.full if address else None
+
+    def _get_address_cache(self) -> dict[str, PostalAddress | None]:
+        """Gibt den Adress-Cache der Instanz zurück (legt ihn bei Bedarf an)."""
+        if self._address_cache is None:
+            self._address_cache = {}
+        return self._address_cache
@@ -5,29 +5,62 @@ FlowAudit Project Share Model
 Modell für granulare Projektfreigaben an externe Nutzer.
 """
 
+import hashlib
+import hmac
 import secrets
-import uuid
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import (
+    ColumnElement,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    LargeBinary,
+    Select,
+    String,
+    func,
+    insert,
+    select,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
 if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
     from app.models.project import Project
     from app.models.user import User
 
 
+def hash_share_token(token: str) -> bytes:
+    """
+    Berechnet den SHA-256-Hash eines Share-Tokens.
+
+    Gespeichert wird nur der Hash; das Klartext-Token wird ausschließlich
+    bei der Erstellung zurückgegeben.
+
+    Args:
+        token: Klartext-Token.
+
+    Returns:
+        32-Byte SHA-256-Digest.
+    """
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
 class ProjectShare(Base):
     """
     Projektfreigabe für externe Nutzer.
 
     Ermöglicht granulare Freigabe von Projekten:
     - An spezifische Nutzer (user_id gesetzt)
-    - Per Link (share_token gesetzt, user_id null)
+    - Per Link (share_token_hash gesetzt, user_id null)
 
     Berechtigungen:
     - read: Nur lesen
@@ -35,11 +68,12 @@ class ProjectShare(Base):
     """
 
     __tablename__ = "project_shares"
+    __table_args__ = (Index("idx_project_shares_valid", "valid_until"),)
 
     id: Mapped[str] = mapped_column(
         UUID(as_uuid=False),
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        server_default=text("gen_random_uuid()"),
     )
 
     # Projekt, das freigegeben wird
@@ -49,7 +83,7 @@ class ProjectShare(Base):
         nullable=False,
         index=True,
     )
-    project: Mapped["Project"] = relationship("Project")
+    project: Mapped["Project"] = relationship("Project", lazy="joined")
 
     # Optional: Nutzer, für den freigegeben wird (null bei Link-Freigaben)
     user_id: Mapped[str | None] = mapped_column(
@@ -58,7 +92,7 @@ class ProjectShare(Base):
         nullable=True,
         index=True,
     )
-    user: Mapped["User | None"] = relationship("User", foreign_keys=[user_id])
+    user: Mapped["User | None"] = relationship("User", foreign_keys=[user_id], lazy="joined")
 
     # Art der Freigabe: "user" oder "link"
     share_type: Mapped[str] = mapped_column(
@@ -66,11 +100,12 @@ class ProjectShare(Base):
         nullable=False,
     )
 
-    # Token für Link-basierte Freigaben
-    share_token: Mapped[str | None] = mapped_column(
-        String(64),
+    # SHA-256 des Tokens für Link-basierte Freigaben
+    share_token_hash: Mapped[bytes | None] = mapped_column(
+        LargeBinary(32),
         unique=True,
         nullable=True,
+        index=True,
     )
 
     # Berechtigungsstufe: "read" oder "write"
@@ -85,11 +120,18 @@ class ProjectShare(Base):
         DateTime(timezone=True),
         nullable=True,
     )
+    # expires_at mit 'infinity' statt NULL, damit ein einfacher B-Tree reicht.
+    # Nur für Abfragen (siehe is_valid); wird in Python nicht gelesen.
+    valid_until: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        Computed("COALESCE(expires_at, 'infinity'::timestamptz)", persisted=True),
+        deferred=True,
+    )
 
     # Audit-Felder
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(UTC),
+        server_default=func.now(),
         nullable=False,
     )
     created_by_id: Mapped[str] = mapped_column(
@@ -97,7 +139,9 @@ class ProjectShare(Base):
         ForeignKey("users.id", ondelete="SET NULL"),
         nullable=False,
     )
-    created_by: Mapped["User"] = relationship("User", foreign_keys=[created_by_id])
+    created_by: Mapped["User"] = relationship(
+        "User", foreign_keys=[created_by_id], lazy="raise"
+    )
 
     def __repr__(self) -> str:
         return f"<ProjectShare(project={self.project_id}, type={self.share_type})>"
@@ -128,24 +172,119 @@ class ProjectShare(Base):
         created_by_id: str,
         permissions: str = "read",
         expires_at: datetime | None = None,
-    ) -> "ProjectShare":
-        """Erstellt eine Link-basierte Freigabe."""
-        return cls(
+    ) -> tuple["ProjectShare", str]:
+        """
+        Erstellt eine Link-basierte Freigabe.
+
+        Returns:
+            Tuple aus Freigabe und Klartext-Token. Das Token wird nicht
+            gespeichert und muss direkt an den Nutzer ausgegeben werden.
+        """
+        token = secrets.token_urlsafe(48)
+        share = cls(
             project_id=project_id,
             share_type="link",
-            share_token=secrets.token_urlsafe(48),
+            share_token_hash=hash_share_token(token),
             permissions=permissions,
             expires_at=expires_at,
             created_by_id=created_by_id,
         )
+        return share, token
 
-    @property
+    @classmethod
+    async def bulk_create_link_shares(
+        cls,
+        session: "AsyncSession",
+        project_id: str,
+        created_by_id: str,
+        count: int,
+        permissions: str = "read",
+        expires_at: datetime | None = None,
+    ) -> list[str]:
+        """
+        Erstellt viele Link-Freigaben mit einem einzigen INSERT.
+
+        Für Massenanlagen (z.B. eine ganze Schulungsgruppe). Es werden keine
+        ORM-Objekte erzeugt; IDs vergibt die Datenbank.
+
+        Args:
+            session: Aktive Datenbank-Session.
+            project_id: Freigegebenes Projekt.
+            created_by_id: Ersteller der Freigaben.
+            count: Anzahl der Freigaben.
+            permissions: Berechtigungsstufe für alle Freigaben.
+            expires_at: Optionales gemeinsames Ablaufdatum.
+
+        Returns:
+            Klartext-Tokens in Einfügereihenfolge.
+        """
+        if count <= 0:
+            return []
+
+        tokens = [secrets.token_urlsafe(48) for _ in range(count)]
+        await session.execute(
+            insert(cls),
+            [
+                {
+                    "project_id": project_id,
+                    "share_type": "link",
+                    "share_token_hash": hash_share_token(token),
+                    "permissions": permissions,
+                    "expires_at": expires_at,
+                    "created_by_id": created_by_id,
+                }
+                for token in tokens
+            ],
+        )
+        return tokens
+
+    @classmethod
+    def select_by_token(cls, token: str) -> Select["ProjectShare"]:
+        """
+        Query für die Freigabe zu einem Klartext-Token.
+
+        Args:
+            token: Vom Client übergebenes Token.
+
+        Returns:
+            Select-Statement über den Token-Hash (Unique-Index).
+        """
+        return select(cls).where(cls.share_token_hash == hash_share_token(token))
+
+    @staticmethod
+    def verify_token(provided: str, stored_hash: bytes | None) -> bool:
+        """
+        Vergleicht ein übergebenes Share-Token in konstanter Zeit.
+
+        Args:
+            provided: Vom Client übergebenes Token.
+            stored_hash: Gespeicherter Token-Hash (None bei Nutzer-Freigaben).
+
+        Returns:
+            True wenn der Hash des Tokens übereinstimmt.
+        """
+        if stored_hash is None:
+            return False
+        return hmac.compare_digest(hash_share_token(provided), stored_hash)
+
+    @hybrid_property
     def is_valid(self) -> bool:
-        """Prüft, ob die Freigabe noch gültig ist."""
+        """
+        Prüft, ob die Freigabe noch gültig ist.
+
+        Als SQL-Ausdruck (``where(ProjectShare.is_valid)``) nutzt der Filter
+        den Index auf valid_until.
+        """
         if self.expires_at is None:
             return True
         return datetime.now(UTC) < self.expires_at
 
+    @is_valid.inplace.expression
+    @classmethod
+    def _is_valid_expression(cls) -> ColumnElement[bool]:
+        """SQL-Variante: valid_until > now()."""
+        return cls.valid_until > func.now()
+
     @property
     def can_write(self) -> bool:
         """Prüft, ob Schreibzugriff erlaubt ist."""
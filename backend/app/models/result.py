@@ -7,14 +7,30 @@ Finale Ergebnisse nach Konfliktlösung zwischen Regel-Engine und LLM.
 
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
-from uuid import uuid4
 
-from sqlalchemy import DateTime, Enum, Float, ForeignKey, Integer, String
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    ColumnElement,
+    Computed,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    cast,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, JSONPATH, UUID
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import Mapped, mapped_column, reconstructor, relationship, validates
 
 from app.database import Base
-from app.models.enums import Provider
+from app.models.enums import Provider, ResultStatus
+
+# JSONPath für Felder mit Konflikt (SQL-Seite von FinalResult.conflict_fields)
+CONFLICT_FIELDS_PATH = "$[*] ? (@.conflict_flag == true)"
 
 if TYPE_CHECKING:
     from app.models.document import Document
@@ -32,12 +48,25 @@ class FinalResult(Base):
     - Benutzer-Overrides
 
     Berechnet Förderbeträge und Traffic-Light-Status.
+
+    computed, fields und overall sind deferred (Gruppe "payload"); für
+    Übersichten reichen status und traffic_light. Abfragen, die die Blöcke
+    lesen, laden sie mit ``.options(undefer_group("payload"))``.
     """
 
     __tablename__ = "final_results"
+    __table_args__ = (
+        Index("idx_final_results_traffic_light", "traffic_light"),
+        # "Neuestes Ergebnis eines Dokuments" (document_id = ? ORDER BY created_at DESC)
+        Index("ix_final_results_document_created", "document_id", "created_at"),
+        # Append-only Zeitachse: BRIN hält Zeitbereichs-Scans klein
+        Index("brin_final_results_created_at", "created_at", postgresql_using="brin"),
+    )
+    # Generierte Spalten nach INSERT/UPDATE per RETURNING nachladen
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4())
+        UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()")
     )
 
     document_id: Mapped[str] = mapped_column(
@@ -48,10 +77,14 @@ class FinalResult(Base):
     )
 
     # Status
-    status: Mapped[str] = mapped_column(String(50), default="PENDING")
+    status: Mapped[ResultStatus] = mapped_column(
+        Enum(ResultStatus), default=ResultStatus.PENDING
+    )
 
     # Berechnete Beträge
-    computed: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+    computed: Mapped[dict[str, Any] | None] = mapped_column(
+        JSONB, nullable=True, deferred=True, deferred_group="payload", deferred_raiseload=True
+    )
     """
     {
         "amounts": {
@@ -65,7 +98,14 @@ class FinalResult(Base):
     """
 
     # Feature-Ergebnisse mit Quellen
-    fields: Mapped[list[dict[str, Any]]] = mapped_column(JSONB, nullable=False, default=list)
+    fields: Mapped[list[dict[str, Any]]] = mapped_column(
+        JSONB,
+        nullable=False,
+        default=list,
+        deferred=True,
+        deferred_group="payload",
+        deferred_raiseload=True,
+    )
     """
     [
         {
@@ -82,7 +122,9 @@ class FinalResult(Base):
     """
 
     # Gesamtbewertung
-    overall: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+    overall: Mapped[dict[str, Any] | None] = mapped_column(
+        JSONB, nullable=True, deferred=True, deferred_group="payload", deferred_raiseload=True
+    )
     """
     {
         "traffic_light": "GREEN",
@@ -91,39 +133,85 @@ class FinalResult(Base):
     }
     """
 
+    # Ampel aus overall->>'traffic_light' (generierte Spalte, indiziert).
+    # Werte siehe TrafficLight; geschrieben wird weiterhin nur overall.
+    traffic_light: Mapped[str | None] = mapped_column(
+        String(10), Computed("overall->>'traffic_light'", persisted=True)
+    )
+
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
     # Relationships
-    document: Mapped["Document"] = relationship("Document", back_populates="final_results")
-    llm_run: Mapped["LlmRun | None"] = relationship("LlmRun")
+    # document ist lazy="raise" (raw_text ist groß) -> explizit per selectinload laden
+    document: Mapped["Document"] = relationship(
+        "Document", back_populates="final_results", lazy="raise"
+    )
+    llm_run: Mapped["LlmRun | None"] = relationship("LlmRun", lazy="joined")
     feedback_entries: Mapped[list["Feedback"]] = relationship(
-        "Feedback", back_populates="final_result"
+        "Feedback", back_populates="final_result", lazy="selectin"
     )
 
+    # Lookup-Cache feature_id -> Feld (nicht gemappt)
+    _fields_by_id = None
+
+    @reconstructor
+    def _init_on_load(self) -> None:
+        """Setzt den Lookup-Cache nach dem Laden aus der DB zurück."""
+        self._fields_by_id = None
+
+    @validates("fields")
+    def _validate_fields(
+        self, key: str, value: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Invalidiert den Lookup-Cache bei Neuzuweisung von fields."""
+        self._fields_by_id = None
+        return value
+
     def __repr__(self) -> str:
         """String-Repräsentation."""
-        traffic = self.overall.get("traffic_light", "?") if self.overall else "?"
-        return f"<FinalResult {self.id[:8]} [{traffic}]>"
+        # id ist vor dem Flush None (serverseitig generiert)
+        short_id = self.id[:8] if self.id else "neu"
+        return f"<FinalResult {short_id} [{self.traffic_light or '?'}]>"
 
-    @property
-    def traffic_light(self) -> str | None:
-        """Traffic-Light-Status."""
-        if self.overall:
-            return self.overall.get("traffic_light")
-        return None
-
-    @property
+    @hybrid_property
     def has_conflicts(self) -> bool:
-        """Prüft auf Konflikte."""
-        if not self.overall:
-            return False
-        return len(self.overall.get("conflicts", [])) > 0
+        """
+        Prüft auf Konflikte.
+
+        Auch als SQL-Ausdruck nutzbar, z.B.
+        ``select(FinalResult).where(FinalResult.has_conflicts)``.
+        """
+        return bool(self.overall and self.overall.get("conflicts"))
+
+    @has_conflicts.inplace.expression
+    @classmethod
+    def _has_conflicts_expression(cls) -> ColumnElement[bool]:
+        """SQL-Variante: Länge von overall->'conflicts' direkt in Postgres."""
+        return func.coalesce(func.jsonb_array_length(cls.overall["conflicts"]), 0) > 0
+
+    @hybrid_property
+    def conflict_fields(self) -> list[dict[str, Any]]:
+        """
+        Felder mit Konflikt.
+
+        Als SQL-Ausdruck per ``jsonb_path_query_array`` auswertbar, sodass
+        nur die Konflikt-Felder statt des ganzen fields-Arrays geladen werden.
+        """
+        return self.get_conflicts()
+
+    @conflict_fields.inplace.expression
+    @classmethod
+    def _conflict_fields_expression(cls) -> ColumnElement[list[dict[str, Any]]]:
+        """SQL-Variante: Konflikt-Felder per JSONPath filtern."""
+        return func.jsonb_path_query_array(
+            cls.fields, cast(CONFLICT_FIELDS_PATH, JSONPATH), type_=JSONB
+        )
 
     @property
     def missing_features(self) -> list[str]:
@@ -143,10 +231,15 @@ class FinalResult(Base):
         Returns:
             Feld-Dict oder None.
         """
-        for field in self.fields:
-            if field.get("feature_id") == feature_id:
-                return field
-        return None
+        if self._fields_by_id is None:
+            # Erstes Vorkommen gewinnt (wie beim bisherigen linearen Scan)
+            by_id: dict[str, dict[str, Any]] = {}
+            for field in self.fields:
+                fid = field.get("feature_id")
+                if fid is not None:
+                    by_id.setdefault(fid, field)
+            self._fields_by_id = by_id
+        return self._fields_by_id.get(feature_id)
 
     def get_conflicts(self) -> list[dict[str, Any]]:
         """
@@ -168,7 +261,7 @@ class AnalysisResult(Base):
     __tablename__ = "analysis_results"
 
     id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4())
+        UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()")
     )
 
     document_id: Mapped[str] = mapped_column(
@@ -196,9 +289,10 @@ class AnalysisResult(Base):
 
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now()
     )
 
     def __repr__(self) -> str:
         """String-Repräsentation."""
-        return f"<AnalysisResult {self.id[:8]} [{self.overall_assessment}]>"
+        short_id = self.id[:8] if self.id else "neu"
+        return f"<AnalysisResult {short_id} [{self.overall_assessment}]>"
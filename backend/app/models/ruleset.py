@@ -7,11 +7,10 @@ Steuerliche Regelwerke (DE_USTG, EU_VAT, UK_VAT).
 
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
-from uuid import uuid4
 
-from sqlalchemy import ARRAY, DateTime, String, UniqueConstraint
+from sqlalchemy import ARRAY, DateTime, String, UniqueConstraint, func, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, reconstructor, validates
 
 from app.database import Base
 
@@ -25,13 +24,19 @@ class Ruleset(Base):
 
     Jedes Ruleset ist versioniert und immutable.
     Änderungen erzeugen neue Versionen.
+
+    legal_references, features und special_rules sind deferred (Gruppe
+    "payload"), damit Listenabfragen sie nicht übertragen. Abfragen, die sie
+    lesen, laden sie mit ``.options(undefer_group("payload"))``.
     """
 
     __tablename__ = "rulesets"
     __table_args__ = (UniqueConstraint("ruleset_id", "version", name="uq_ruleset_version"),)
+    # updated_at nach UPDATE per RETURNING nachladen
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4())
+        UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()")
     )
     ruleset_id: Mapped[str] = mapped_column(String(50), nullable=False, index=True)
     version: Mapped[str] = mapped_column(String(20), nullable=False)
@@ -39,10 +44,30 @@ class Ruleset(Base):
     title_de: Mapped[str] = mapped_column(String(255), nullable=False)
     title_en: Mapped[str] = mapped_column(String(255), nullable=False)
 
-    # JSON-Felder
-    legal_references: Mapped[list[dict[str, Any]]] = mapped_column(JSONB, nullable=False, default=list)
-    features: Mapped[list[dict[str, Any]]] = mapped_column(JSONB, nullable=False, default=list)
-    special_rules: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+    # JSON-Felder (Gruppe "payload": erst bei Bedarf laden, siehe Klassendoku)
+    legal_references: Mapped[list[dict[str, Any]]] = mapped_column(
+        JSONB,
+        nullable=False,
+        default=list,
+        deferred=True,
+        deferred_group="payload",
+        deferred_raiseload=True,
+    )
+    features: Mapped[list[dict[str, Any]]] = mapped_column(
+        JSONB,
+        nullable=False,
+        default=list,
+        deferred=True,
+        deferred_group="payload",
+        deferred_raiseload=True,
+    )
+    special_rules: Mapped[dict[str, Any] | None] = mapped_column(
+        JSONB,
+        nullable=True,
+        deferred=True,
+        deferred_group="payload",
+        deferred_raiseload=True,
+    )
 
     # Spracheinstellungen
     default_language: Mapped[str] = mapped_column(String(5), default="de")
@@ -58,16 +83,70 @@ class Ruleset(Base):
 
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
+    # Aus features abgeleitete Indizes (nicht gemappt), siehe _index_features()
+    _features_by_id = None
+    _required_features = None
+    _optional_features = None
+
+    @reconstructor
+    def _init_on_load(self) -> None:
+        """Setzt die Feature-Indizes nach dem Laden aus der DB zurück."""
+        self._features_by_id = None
+        self._required_features = None
+        self._optional_features = None
+
+    @validates("features")
+    def _validate_features(
+        self, key: str, value: list[dict[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Invalidiert die Feature-Indizes bei Neuzuweisung von features."""
+        self._features_by_id = None
+        self._required_features = None
+        self._optional_features = None
+        return value
+
     def __repr__(self) -> str:
         """String-Repräsentation."""
         return f"<Ruleset {self.ruleset_id} v{self.version}>"
 
+    def _index_features(
+        self,
+    ) -> tuple[
+        dict[str, dict[str, Any]], tuple[dict[str, Any], ...], tuple[dict[str, Any], ...]
+    ]:
+        """
+        Partitioniert features in einem Durchlauf.
+
+        Baut den ID-Index sowie die Pflicht- und optionalen Features als
+        Tuples. Läuft erst beim ersten Zugriff, damit reine Listenabfragen
+        features nicht anfassen müssen.
+
+        Returns:
+            ID-Index, Pflichtfeatures, übrige Features
+        """
+        by_id: dict[str, dict[str, Any]] = {}
+        required: list[dict[str, Any]] = []
+        optional: list[dict[str, Any]] = []
+        for feature in self.features:
+            fid = feature.get("feature_id")
+            if fid is not None:
+                # Erstes Vorkommen gewinnt (wie beim linearen Scan)
+                by_id.setdefault(fid, feature)
+            if feature.get("required_level") == "REQUIRED":
+                required.append(feature)
+            else:
+                optional.append(feature)
+        self._features_by_id = by_id
+        self._required_features = tuple(required)
+        self._optional_features = tuple(optional)
+        return self._features_by_id, self._required_features, self._optional_features
+
     def get_feature_by_id(self, feature_id: str) -> dict[str, Any] | None:
         """
         Findet ein Feature nach ID.
@@ -78,19 +157,31 @@ class Ruleset(Base):
         Returns:
             Feature-Dict oder None.
         """
-        for feature in self.features:
-            if feature.get("feature_id") == feature_id:
-                return feature
-        return None
+        by_id = self._features_by_id
+        if by_id is None:
+            by_id, _, _ = self._index_features()
+        return by_id.get(feature_id)
 
-    def get_required_features(self) -> list[dict[str, Any]]:
+    def get_required_features(self) -> tuple[dict[str, Any], ...]:
         """
         Gibt alle Pflichtfeatures zurück.
 
         Returns:
-            Liste der Pflichtfeatures.
+            Tuple der Pflichtfeatures.
+        """
+        required = self._required_features
+        if required is None:
+            _, required, _ = self._index_features()
+        return required
+
+    def get_optional_features(self) -> tuple[dict[str, Any], ...]:
+        """
+        Gibt alle nicht verpflichtenden Features zurück.
+
+        Returns:
+            Tuple der übrigen Features.
         """
-        return [
-            f for f in self.features
-            if f.get("required_level") == "REQUIRED"
-        ]
+        optional = self._optional_features
+        if optional is None:
+            _, _, optional = self._index_features()
+        return optional
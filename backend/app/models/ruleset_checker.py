@@ -7,15 +7,59 @@ Konfiguration der Prüfmodule (Risk, Semantic, Economic) pro Regelwerk.
 
 from datetime import datetime
 from typing import Any
-from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, String
+import orjson
+from sqlalchemy import Boolean, Computed, DateTime, ForeignKey, Index, String, func, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
 
+def _jsonb_literal(value: dict[str, Any]) -> str:
+    """Serialisiert einen Default als JSON-Literal für server_default."""
+    return orjson.dumps(value).decode()
+
+
+# Standard-Konfigurationen (werden als server_default in der DB gesetzt)
+RISK_CHECKER_DEFAULT: dict[str, Any] = {
+    "enabled": True,
+    "severity_threshold": "MEDIUM",
+    "check_self_invoice": True,
+    "check_duplicate_invoice": True,
+    "check_round_amounts": True,
+    "check_weekend_dates": True,
+    "round_amount_threshold": 1000,
+}
+
+SEMANTIC_CHECKER_DEFAULT: dict[str, Any] = {
+    "enabled": True,
+    "severity_threshold": "MEDIUM",
+    "check_project_relevance": True,
+    "check_description_quality": True,
+    "min_relevance_score": 0.6,
+    "use_rag_context": True,
+}
+
+ECONOMIC_CHECKER_DEFAULT: dict[str, Any] = {
+    "enabled": True,
+    "severity_threshold": "LOW",
+    "check_budget_limits": True,
+    "check_unit_prices": True,
+    "check_funding_rate": True,
+    "max_deviation_percent": 20,
+}
+
+LEGAL_CHECKER_DEFAULT: dict[str, Any] = {
+    "enabled": False,
+    "funding_period": "2021-2027",
+    "max_results": 5,
+    "min_relevance_score": 0.6,
+    "use_hierarchy_weighting": True,
+    "include_definitions": True,
+}
+
+
 class RulesetCheckerSettings(Base):
     """
     Prüfmodul-Konfiguration für ein Regelwerk.
@@ -27,9 +71,39 @@ class RulesetCheckerSettings(Base):
     """
 
     __tablename__ = "ruleset_checker_settings"
+    # GIN (jsonb_path_ops) für @>-Containment-Abfragen
+    __table_args__ = (
+        Index(
+            "idx_ruleset_checker_settings_risk_checker_gin",
+            "risk_checker",
+            postgresql_using="gin",
+            postgresql_ops={"risk_checker": "jsonb_path_ops"},
+        ),
+        Index(
+            "idx_ruleset_checker_settings_semantic_checker_gin",
+            "semantic_checker",
+            postgresql_using="gin",
+            postgresql_ops={"semantic_checker": "jsonb_path_ops"},
+        ),
+        Index(
+            "idx_ruleset_checker_settings_economic_checker_gin",
+            "economic_checker",
+            postgresql_using="gin",
+            postgresql_ops={"economic_checker": "jsonb_path_ops"},
+        ),
+        Index(
+            "idx_ruleset_checker_settings_legal_checker_gin",
+            "legal_checker",
+            postgresql_using="gin",
+            postgresql_ops={"legal_checker": "jsonb_path_ops"},
+        ),
+    )
+    # updated_at, generierte Spalten und JSONB-Defaults nach INSERT/UPDATE
+    # per RETURNING nachladen
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4())
+        UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()")
     )
 
     # Referenz zum Regelwerk (ruleset_id, nicht die UUID)
@@ -39,67 +113,56 @@ class RulesetCheckerSettings(Base):
 
     # Risk Checker Konfiguration
     risk_checker: Mapped[dict[str, Any]] = mapped_column(
-        JSONB,
-        nullable=False,
-        default=lambda: {
-            "enabled": True,
-            "severity_threshold": "MEDIUM",
-            "check_self_invoice": True,
-            "check_duplicate_invoice": True,
-            "check_round_amounts": True,
-            "check_weekend_dates": True,
-            "round_amount_threshold": 1000,
-        }
+        JSONB, nullable=False, server_default=_jsonb_literal(RISK_CHECKER_DEFAULT)
     )
 
     # Semantic Checker Konfiguration
     semantic_checker: Mapped[dict[str, Any]] = mapped_column(
-        JSONB,
-        nullable=False,
-        default=lambda: {
-            "enabled": True,
-            "severity_threshold": "MEDIUM",
-            "check_project_relevance": True,
-            "check_description_quality": True,
-            "min_relevance_score": 0.6,
-            "use_rag_context": True,
-        }
+        JSONB, nullable=False, server_default=_jsonb_literal(SEMANTIC_CHECKER_DEFAULT)
     )
 
     # Economic Checker Konfiguration
     economic_checker: Mapped[dict[str, Any]] = mapped_column(
-        JSONB,
-        nullable=False,
-        default=lambda: {
-            "enabled": True,
-            "severity_threshold": "LOW",
-            "check_budget_limits": True,
-            "check_unit_prices": True,
-            "check_funding_rate": True,
-            "max_deviation_percent": 20,
-        }
+        JSONB, nullable=False, server_default=_jsonb_literal(ECONOMIC_CHECKER_DEFAULT)
     )
 
     # Legal Checker Konfiguration (Legal Retrieval / Normenhierarchie)
     legal_checker: Mapped[dict[str, Any]] = mapped_column(
-        JSONB,
-        nullable=False,
-        default=lambda: {
-            "enabled": False,
-            "funding_period": "2021-2027",
-            "max_results": 5,
-            "min_relevance_score": 0.6,
-            "use_hierarchy_weighting": True,
-            "include_definitions": True,
-        }
+        JSONB, nullable=False, server_default=_jsonb_literal(LEGAL_CHECKER_DEFAULT)
+    )
+
+    # Häufig gefilterte Schlüssel als generierte Spalten (read-only).
+    # Schreibzugriffe laufen weiterhin nur über die *_checker-Dicts.
+    risk_enabled: Mapped[bool | None] = mapped_column(
+        Boolean, Computed("(risk_checker->>'enabled')::boolean", persisted=True), index=True
+    )
+    risk_severity: Mapped[str | None] = mapped_column(
+        String(10),
+        Computed("risk_checker->>'severity_threshold'", persisted=True),
+        index=True,
+    )
+    semantic_enabled: Mapped[bool | None] = mapped_column(
+        Boolean, Computed("(semantic_checker->>'enabled')::boolean", persisted=True), index=True
+    )
+    semantic_severity: Mapped[str | None] = mapped_column(
+        String(10), Computed("semantic_checker->>'severity_threshold'", persisted=True)
+    )
+    economic_enabled: Mapped[bool | None] = mapped_column(
+        Boolean, Computed("(economic_checker->>'enabled')::boolean", persisted=True), index=True
+    )
+    economic_severity: Mapped[str | None] = mapped_column(
+        String(10), Computed("economic_checker->>'severity_threshold'", persisted=True)
+    )
+    legal_enabled: Mapped[bool | None] = mapped_column(
+        Boolean, Computed("(legal_checker->>'enabled')::boolean", persisted=True), index=True
     )
 
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
     def __repr__(self) -> str:
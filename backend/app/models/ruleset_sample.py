@@ -7,9 +7,19 @@ Musterdokumente für Regelwerke (Training/RAG).
 
 from datetime import datetime
 from typing import Any
-from uuid import uuid4
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -27,9 +37,40 @@ class RulesetSample(Base):
     """
 
     __tablename__ = "ruleset_samples"
+    __table_args__ = (
+        # Duplikat-Erkennung beim Upload: ein Dateiinhalt pro Regelwerk
+        Index("uq_ruleset_sample_hash", "ruleset_id", "file_hash", unique=True),
+        # Review-Queue: nur die noch zu bearbeitenden Samples indizieren
+        Index(
+            "ix_ruleset_samples_pending",
+            "ruleset_id",
+            postgresql_where=text("status IN ('UPLOADED', 'PENDING_REVIEW')"),
+        ),
+        # GIN (jsonb_path_ops) für @>-Containment-Abfragen
+        Index(
+            "idx_ruleset_samples_extracted_data_gin",
+            "extracted_data",
+            postgresql_using="gin",
+            postgresql_ops={"extracted_data": "jsonb_path_ops"},
+        ),
+        Index(
+            "idx_ruleset_samples_ground_truth_gin",
+            "ground_truth",
+            postgresql_using="gin",
+            postgresql_ops={"ground_truth": "jsonb_path_ops"},
+        ),
+        Index(
+            "idx_ruleset_samples_rag_example_ids_gin",
+            "rag_example_ids",
+            postgresql_using="gin",
+            postgresql_ops={"rag_example_ids": "jsonb_path_ops"},
+        ),
+    )
+    # updated_at nach UPDATE per RETURNING nachladen
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4())
+        UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()")
     )
 
     # Ruleset-Referenz
@@ -39,7 +80,8 @@ class RulesetSample(Base):
     # Datei-Informationen
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
     file_path: Mapped[str] = mapped_column(String(500), nullable=False)
-    file_hash: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    # SHA-256 als 32 Rohbytes (halb so groß wie Hex, Vergleich per memcmp)
+    file_hash: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
     file_size: Mapped[int] = mapped_column(Integer, nullable=False)
     mime_type: Mapped[str] = mapped_column(String(100), default="application/pdf")
 
@@ -48,28 +90,33 @@ class RulesetSample(Base):
 
     # Status
     status: Mapped[SampleStatus] = mapped_column(
-        String(20), default=SampleStatus.UPLOADED, nullable=False, index=True
+        Enum(SampleStatus), default=SampleStatus.UPLOADED, nullable=False
     )
 
     # Extrahierte Daten (nach Parsing)
-    raw_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # raw_text kann mehrere MB groß sein -> nur bei Bedarf per undefer() laden
+    raw_text: Mapped[str | None] = mapped_column(
+        Text, nullable=True, deferred=True, deferred_raiseload=True
+    )
     extracted_data: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
 
     # Ground Truth (nach Review)
     ground_truth: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
 
     # Parsing-Fehler (falls vorhanden)
-    parse_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    parse_error: Mapped[str | None] = mapped_column(
+        Text, nullable=True, deferred=True, deferred_raiseload=True
+    )
 
     # RAG-Referenz (nach Approval)
     rag_example_ids: Mapped[list[str] | None] = mapped_column(JSONB, nullable=True)
 
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
     processed_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -87,6 +134,11 @@ class RulesetSample(Base):
         """String-Repräsentation."""
         return f"<RulesetSample {self.filename} ({self.status})>"
 
+    @property
+    def file_hash_hex(self) -> str:
+        """SHA-256 der Datei als Hex-String (für Anzeige/Logs)."""
+        return self.file_hash.hex()
+
     @property
     def is_pending_review(self) -> bool:
         """Prüft ob Sample auf Review wartet."""
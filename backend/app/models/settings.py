@@ -5,17 +5,35 @@ FlowAudit Settings Models
 Anwendungs-Einstellungen und API-Key-Speicherung.
 """
 
+import copy
+import time
 from datetime import datetime
-from typing import Any
-from uuid import uuid4
-
-from sqlalchemy import Boolean, DateTime, Enum, LargeBinary, String
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Enum,
+    Index,
+    LargeBinary,
+    String,
+    func,
+    select,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
 from app.models.enums import Provider
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Prozesslokaler Cache für Setting-Werte: key -> (Ablaufzeit, Wert)
+SETTING_CACHE_TTL = 60.0
+_setting_cache: dict[str, tuple[float, Any]] = {}
+
 
 class Setting(Base):
     """
@@ -25,9 +43,20 @@ class Setting(Base):
     """
 
     __tablename__ = "settings"
+    # GIN (jsonb_path_ops) für @>-Containment-Abfragen
+    __table_args__ = (
+        Index(
+            "idx_settings_value_gin",
+            "value",
+            postgresql_using="gin",
+            postgresql_ops={"value": "jsonb_path_ops"},
+        ),
+    )
+    # updated_at nach UPDATE per RETURNING nachladen
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4())
+        UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()")
     )
 
     key: Mapped[str] = mapped_column(String(100), nullable=False, unique=True, index=True)
@@ -35,13 +64,53 @@ class Setting(Base):
 
     # Zeitstempel
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
     def __repr__(self) -> str:
         """String-Repräsentation."""
         return f"<Setting {self.key}>"
 
+    @classmethod
+    async def get_cached(cls, session: "AsyncSession", key: str) -> Any:
+        """
+        Liest einen Setting-Wert über den prozesslokalen TTL-Cache.
+
+        Schreibzugriffe im selben Prozess invalidieren per
+        ``invalidate_cache``; andere Worker sehen Änderungen spätestens
+        nach ``SETTING_CACHE_TTL`` Sekunden.
+
+        Args:
+            session: Aktive Datenbank-Session.
+            key: Setting-Key.
+
+        Returns:
+            Kopie des gespeicherten Werts (Änderungen wirken nicht auf den
+            Cache) oder None, falls der Key nicht existiert.
+        """
+        now = time.monotonic()
+        cached = _setting_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return copy.deepcopy(cached[1])
+
+        result = await session.execute(select(cls.value).where(cls.key == key))
+        value = result.scalar_one_or_none()
+        _setting_cache[key] = (now + SETTING_CACHE_TTL, value)
+        return copy.deepcopy(value)
+
+    @staticmethod
+    def invalidate_cache(key: str | None = None) -> None:
+        """
+        Verwirft gecachte Setting-Werte.
+
+        Args:
+            key: Nur diesen Key verwerfen; None leert den gesamten Cache.
+        """
+        if key is None:
+            _setting_cache.clear()
+        else:
+            _setting_cache.pop(key, None)
+
 
 class ApiKey(Base):
     """
@@ -51,9 +120,11 @@ class ApiKey(Base):
     """
 
     __tablename__ = "api_keys"
+    # updated_at nach UPDATE per RETURNING nachladen
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4())
+        UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()")
     )
 
     provider: Mapped[Provider] = mapped_column(
@@ -64,7 +135,7 @@ class ApiKey(Base):
     encrypted_key: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
 
     # Vorschau (letzte 4 Zeichen)
-    key_preview: Mapped[str | None] = mapped_column(String(50), nullable=True)
+    key_preview: Mapped[str | None] = mapped_column(String(8), nullable=True)
 
     # Status
     is_valid: Mapped[bool] = mapped_column(Boolean, default=True)
@@ -74,10 +145,10 @@ class ApiKey(Base):
 
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
     )
 
     def __repr__(self) -> str:
@@ -7,15 +7,29 @@ Speichert hochgeladene Lösungsdateien für LLM-Training.
 
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
-from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    Text,
+    func,
+    insert,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
 if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
     from app.models.project import Project
     from app.models.user import User
 
@@ -26,14 +40,17 @@ class SolutionFile(Base):
 
     Enthält:
     - Metadaten der Datei
-    - Geparste Einträge
     - Anwendungsstatus
+
+    Die geparsten Einträge liegen in SolutionFileEntry (eine Zeile pro Eintrag).
     """
 
     __tablename__ = "solution_files"
+    # updated_at nach UPDATE per RETURNING nachladen
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4())
+        UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()")
     )
 
     # Projekt-Zuordnung
@@ -43,7 +60,9 @@ class SolutionFile(Base):
         nullable=False,
         index=True,
     )
-    project: Mapped["Project"] = relationship("Project", backref="solution_files")
+    project: Mapped["Project"] = relationship(
+        "Project", back_populates="solution_files", lazy="raise"
+    )
 
     # Datei-Metadaten
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -62,9 +81,6 @@ class SolutionFile(Base):
     invalid_count: Mapped[int] = mapped_column(Integer, default=0)
     error_count: Mapped[int] = mapped_column(Integer, default=0)
 
-    # Einträge als JSON (für spätere Verarbeitung)
-    entries: Mapped[list[dict[str, Any]]] = mapped_column(JSONB, default=list)
-
     # Anwendungsstatus
     applied: Mapped[bool] = mapped_column(Boolean, default=False)
     applied_at: Mapped[datetime | None] = mapped_column(
@@ -75,7 +91,7 @@ class SolutionFile(Base):
         ForeignKey("users.id", ondelete="SET NULL"),
         nullable=True,
     )
-    applied_by: Mapped["User | None"] = relationship("User")
+    applied_by: Mapped["User | None"] = relationship("User", lazy="raise")
 
     # Anwendungsstatistik
     applied_count: Mapped[int] = mapped_column(Integer, default=0)
@@ -84,10 +100,26 @@ class SolutionFile(Base):
 
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    # Relationships
+    entries: Mapped[list["SolutionFileEntry"]] = relationship(
+        "SolutionFileEntry",
+        back_populates="solution_file",
+        cascade="all, delete-orphan",
+        order_by="SolutionFileEntry.position",
+        lazy="raise",
+        passive_deletes=True,
+    )
+    matches: Mapped[list["SolutionMatch"]] = relationship(
+        "SolutionMatch",
+        back_populates="solution_file",
+        lazy="raise",
+        passive_deletes=True,
     )
 
     def __repr__(self) -> str:
@@ -95,6 +127,82 @@ class SolutionFile(Base):
         return f"<SolutionFile {self.filename} ({self.entry_count} entries)>"
 
 
+class SolutionFileEntry(Base):
+    """
+    Ein geparster Eintrag (eine Rechnung) einer Lösungsdatei.
+
+    Einzelne Zeilen statt eines JSONB-Arrays, damit Einträge seitenweise
+    gelesen und über fields indiziert werden können.
+    """
+
+    __tablename__ = "solution_file_entries"
+    __table_args__ = (
+        # Positionen aus CSV-Dateien sind nicht zwingend eindeutig
+        Index("ix_solution_file_entries_file_position", "solution_file_id", "position"),
+        # GIN (jsonb_path_ops) für @>-Containment-Abfragen
+        Index(
+            "idx_solution_file_entries_fields_gin",
+            "fields",
+            postgresql_using="gin",
+            postgresql_ops={"fields": "jsonb_path_ops"},
+        ),
+    )
+
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()")
+    )
+
+    solution_file_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("solution_files.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    solution_file: Mapped["SolutionFile"] = relationship(
+        "SolutionFile", back_populates="entries", lazy="raise"
+    )
+
+    # Eintragsdaten (Struktur wie SolutionEntry.to_dict())
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    is_valid: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+    errors: Mapped[list[dict[str, Any]]] = mapped_column(JSONB, nullable=False, default=list)
+    fields: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False, default=dict)
+    template: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    generator_version: Mapped[str | None] = mapped_column(String(50), nullable=True)
+
+    def __repr__(self) -> str:
+        """String-Repräsentation."""
+        return f"<SolutionFileEntry {self.position}: {self.filename}>"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Konvertiert zu Dictionary (Format von SolutionEntry.to_dict())."""
+        return {
+            "position": self.position,
+            "filename": self.filename,
+            "is_valid": self.is_valid,
+            "errors": self.errors,
+            "fields": self.fields,
+            "template": self.template,
+            "generator_version": self.generator_version,
+        }
+
+    @classmethod
+    async def bulk_create(
+        cls, session: "AsyncSession", rows: list[dict[str, Any]]
+    ) -> None:
+        """
+        Legt viele Einträge mit einem einzigen INSERT an.
+
+        Args:
+            session: Aktive Datenbank-Session.
+            rows: Spaltenwerte je Eintrag (inkl. solution_file_id).
+        """
+        if not rows:
+            return
+
+        await session.execute(insert(cls), rows)
+
+
 class SolutionMatch(Base):
     """
     Verknüpfung zwischen Lösungsdatei-Eintrag und Dokument.
@@ -105,9 +213,24 @@ class SolutionMatch(Base):
     """
 
     __tablename__ = "solution_matches"
+    # GIN (jsonb_path_ops) für @>-Containment-Abfragen
+    __table_args__ = (
+        Index(
+            "idx_solution_matches_errors_gin",
+            "errors",
+            postgresql_using="gin",
+            postgresql_ops={"errors": "jsonb_path_ops"},
+        ),
+        Index(
+            "idx_solution_matches_fields_gin",
+            "fields",
+            postgresql_using="gin",
+            postgresql_ops={"fields": "jsonb_path_ops"},
+        ),
+    )
 
     id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4())
+        UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()")
     )
 
     # Lösungsdatei-Zuordnung
@@ -118,7 +241,7 @@ class SolutionMatch(Base):
         index=True,
     )
     solution_file: Mapped["SolutionFile"] = relationship(
-        "SolutionFile", backref="matches"
+        "SolutionFile", back_populates="matches", lazy="raise"
     )
 
     # Dokument-Zuordnung
@@ -131,8 +254,22 @@ class SolutionMatch(Base):
 
     # Match-Details
     solution_position: Mapped[int] = mapped_column(Integer, nullable=False)
-    solution_filename: Mapped[str] = mapped_column(String(255), nullable=False)
-    match_confidence: Mapped[float] = mapped_column(default=1.0)
+    # Zugehöriger Eintrag (Positionen sind nicht eindeutig, daher per id);
+    # der Dateiname wird nicht kopiert, sondern von dort gelesen
+    solution_entry_id: Mapped[str | None] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("solution_file_entries.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    solution_entry: Mapped["SolutionFileEntry | None"] = relationship(
+        "SolutionFileEntry", lazy="raise"
+    )
+    solution_filename: AssociationProxy[str | None] = association_proxy(
+        "solution_entry", "filename"
+    )
+    # Konfidenz skaliert auf 0..CONFIDENCE_SCALE (SmallInteger statt Float)
+    match_confidence: Mapped[int] = mapped_column(SmallInteger, default=10000)
     match_reason: Mapped[str] = mapped_column(String(255), nullable=True)
     strategy_used: Mapped[str] = mapped_column(String(50), nullable=True)
 
@@ -150,14 +287,61 @@ class SolutionMatch(Base):
     fields_updated: Mapped[int] = mapped_column(Integer, default=0)
     rag_examples_created: Mapped[int] = mapped_column(Integer, default=0)
 
-    # Notizen
-    notes: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Notizen (deferred, in Listen nicht benötigt)
+    notes: Mapped[str | None] = mapped_column(
+        Text, nullable=True, deferred=True, deferred_raiseload=True
+    )
 
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now()
     )
 
     def __repr__(self) -> str:
         """String-Repräsentation."""
-        return f"<SolutionMatch {self.solution_filename} -> {self.document_id}>"
+        return f"<SolutionMatch {self.solution_position} -> {self.document_id}>"
+
+    CONFIDENCE_SCALE = 10000
+
+    @classmethod
+    def quantize_confidence(cls, confidence: float) -> int:
+        """
+        Rechnet eine Konfidenz (0-1) in den gespeicherten Ganzzahlwert um.
+
+        Args:
+            confidence: Konfidenz als Float.
+
+        Returns:
+            Wert in 0..CONFIDENCE_SCALE, z.B. 0.8 -> 8000.
+        """
+        return round(min(max(confidence, 0.0), 1.0) * cls.CONFIDENCE_SCALE)
+
+    @property
+    def match_confidence_float(self) -> float:
+        """Konfidenz als Float (0-1)."""
+        return self.match_confidence / self.CONFIDENCE_SCALE
+
+    @classmethod
+    async def bulk_create(
+        cls, session: "AsyncSession", rows: list[dict[str, Any]]
+    ) -> list[str]:
+        """
+        Legt viele Matches mit einem einzigen INSERT an.
+
+        Es werden keine ORM-Objekte erzeugt; ID und created_at vergibt die
+        Datenbank.
+
+        Args:
+            session: Aktive Datenbank-Session.
+            rows: Spaltenwerte je Match.
+
+        Returns:
+            IDs der angelegten Matches in Reihenfolge von ``rows``.
+        """
+        if not rows:
+            return []
+
+        result = await session.execute(
+            insert(cls).returning(cls.id, sort_by_parameter_order=True), rows
+        )
+        return list(result.scalars())
@@ -5,11 +5,27 @@ FlowAudit Training Models
 Training-Beispiele, Datasets, Training-Runs und Modell-Registry.
 """
 
+from collections.abc import AsyncIterator
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
-from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, Enum, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    event,
+    func,
+    insert,
+    select,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -17,6 +33,8 @@ from app.database import Base
 from app.models.enums import Provider
 
 if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
     from app.models.document import Document
     from app.models.project import Project
 
@@ -29,9 +47,27 @@ class TrainingExample(Base):
     """
 
     __tablename__ = "training_examples"
+    # GIN (jsonb_path_ops) für @>-Containment-Abfragen
+    __table_args__ = (
+        Index(
+            "idx_training_examples_label_json_gin",
+            "label_json",
+            postgresql_using="gin",
+            postgresql_ops={"label_json": "jsonb_path_ops"},
+        ),
+        # Covering-Index für den Dataset-Export (Index-Only-Scan)
+        Index(
+            "ix_training_examples_module_proj",
+            "module",
+            "project_id",
+            postgresql_include=["label_json", "source"],
+        ),
+        # Listen-Partitionierung nach Modul (Partitionen siehe unten)
+        {"postgresql_partition_by": "LIST (module)"},
+    )
 
     id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4())
+        UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()")
     )
 
     document_id: Mapped[str | None] = mapped_column(
@@ -41,8 +77,8 @@ class TrainingExample(Base):
         UUID(as_uuid=False), ForeignKey("projects.id"), nullable=True
     )
 
-    # Modul (1=UStG, 2=Projektbezug, 3=Risiko)
-    module: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    # Modul (1=UStG, 2=Projektbezug, 3=Risiko); Partitionsschlüssel, daher Teil des PK
+    module: Mapped[int] = mapped_column(Integer, primary_key=True)
 
     # Goldstandard-Labels
     label_json: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
@@ -54,16 +90,94 @@ class TrainingExample(Base):
 
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now()
     )
 
     # Relationships
-    document: Mapped["Document | None"] = relationship("Document")
-    project: Mapped["Project | None"] = relationship("Project")
+    document: Mapped["Document | None"] = relationship("Document", lazy="raise")
+    project: Mapped["Project | None"] = relationship("Project", lazy="raise")
 
     def __repr__(self) -> str:
         """String-Repräsentation."""
-        return f"<TrainingExample {self.id[:8]} Module {self.module}>"
+        # id ist vor dem Flush None (serverseitig generiert)
+        short_id = self.id[:8] if self.id else "neu"
+        return f"<TrainingExample {short_id} Module {self.module}>"
+
+    @classmethod
+    async def bulk_create(
+        cls, session: "AsyncSession", rows: list[dict[str, Any]]
+    ) -> list[str]:
+        """
+        Legt viele Training-Beispiele mit einem einzigen INSERT an.
+
+        Für Massenimporte; es werden keine ORM-Objekte erzeugt, ID und
+        created_at vergibt die Datenbank.
+
+        Args:
+            session: Aktive Datenbank-Session.
+            rows: Spaltenwerte je Beispiel.
+
+        Returns:
+            IDs der angelegten Beispiele in Reihenfolge von ``rows``.
+        """
+        if not rows:
+            return []
+
+        result = await session.execute(
+            insert(cls).returning(cls.id, sort_by_parameter_order=True), rows
+        )
+        return list(result.scalars())
+
+    @classmethod
+    async def stream_labels(
+        cls,
+        session: "AsyncSession",
+        module: int,
+        project_id: str | None = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[tuple[dict[str, Any], str]]:
+        """
+        Liefert Labels und Quelle aller Beispiele eines Moduls schubweise.
+
+        Liest nur die Spalten des Covering-Index und hält höchstens
+        ``batch_size`` Zeilen gleichzeitig im Speicher.
+
+        Args:
+            session: Aktive Datenbank-Session.
+            module: Prüfmodul (1-3).
+            project_id: Optional auf ein Projekt einschränken.
+            batch_size: Zeilen pro Fetch.
+
+        Yields:
+            Tupel aus ``label_json`` und ``source``.
+        """
+        stmt = select(cls.label_json, cls.source).where(cls.module == module)
+        if project_id is not None:
+            stmt = stmt.where(cls.project_id == project_id)
+
+        result = await session.stream(stmt.execution_options(yield_per=batch_size))
+        async for label_json, source in result:
+            yield label_json, source
+
+
+# Partitionen je Modul; DEFAULT fängt unerwartete Modulnummern ab
+for _module in (1, 2, 3):
+    event.listen(
+        TrainingExample.__table__,
+        "after_create",
+        DDL(  # type: ignore[no-untyped-call]
+            f"CREATE TABLE IF NOT EXISTS training_examples_m{_module} "
+            f"PARTITION OF training_examples FOR VALUES IN ({_module})"
+        ),
+    )
+event.listen(
+    TrainingExample.__table__,
+    "after_create",
+    DDL(  # type: ignore[no-untyped-call]
+        "CREATE TABLE IF NOT EXISTS training_examples_default "
+        "PARTITION OF training_examples DEFAULT"
+    ),
+)
 
 
 class TrainingDataset(Base):
@@ -74,9 +188,18 @@ class TrainingDataset(Base):
     """
 
     __tablename__ = "training_datasets"
+    # GIN (jsonb_path_ops) für @>-Containment-Abfragen
+    __table_args__ = (
+        Index(
+            "idx_training_datasets_manifest_gin",
+            "manifest",
+            postgresql_using="gin",
+            postgresql_ops={"manifest": "jsonb_path_ops"},
+        ),
+    )
 
     id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4())
+        UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()")
     )
 
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -95,12 +218,12 @@ class TrainingDataset(Base):
 
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now()
     )
 
     # Relationships
     training_runs: Mapped[list["TrainingRun"]] = relationship(
-        "TrainingRun", back_populates="dataset"
+        "TrainingRun", back_populates="dataset", lazy="raise"
     )
 
     def __repr__(self) -> str:
@@ -116,9 +239,18 @@ class TrainingRun(Base):
     """
 
     __tablename__ = "training_runs"
+    # GIN (jsonb_path_ops) für @>-Containment-Abfragen
+    __table_args__ = (
+        Index(
+            "idx_training_runs_metrics_gin",
+            "metrics",
+            postgresql_using="gin",
+            postgresql_ops={"metrics": "jsonb_path_ops"},
+        ),
+    )
 
     id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4())
+        UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()")
     )
 
     dataset_id: Mapped[str | None] = mapped_column(
@@ -149,11 +281,13 @@ class TrainingRun(Base):
 
     # Artifacts
     artifacts_path: Mapped[str | None] = mapped_column(String(1000), nullable=True)
-    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    error_message: Mapped[str | None] = mapped_column(
+        Text, nullable=True, deferred=True, deferred_raiseload=True
+    )
 
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now()
     )
     completed_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -161,12 +295,13 @@ class TrainingRun(Base):
 
     # Relationships
     dataset: Mapped["TrainingDataset | None"] = relationship(
-        "TrainingDataset", back_populates="training_runs"
+        "TrainingDataset", back_populates="training_runs", lazy="raise"
     )
 
     def __repr__(self) -> str:
         """String-Repräsentation."""
-        return f"<TrainingRun {self.id[:8]} [{self.base_model}]>"
+        short_id = self.id[:8] if self.id else "neu"
+        return f"<TrainingRun {short_id} [{self.base_model}]>"
 
 
 class ModelRegistry(Base):
@@ -177,9 +312,18 @@ class ModelRegistry(Base):
     """
 
     __tablename__ = "model_registry"
+    # GIN (jsonb_path_ops) für @>-Containment-Abfragen
+    __table_args__ = (
+        Index(
+            "idx_model_registry_metrics_gin",
+            "metrics",
+            postgresql_using="gin",
+            postgresql_ops={"metrics": "jsonb_path_ops"},
+        ),
+    )
 
     id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4())
+        UUID(as_uuid=False), primary_key=True, server_default=text("gen_random_uuid()")
     )
 
     model_name: Mapped[str] = mapped_column(String(100), nullable=False, unique=True)
@@ -207,11 +351,11 @@ class ModelRegistry(Base):
 
     # Zeitstempel
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), server_default=func.now()
     )
 
     # Relationships
-    training_run: Mapped["TrainingRun | None"] = relationship("TrainingRun")
+    training_run: Mapped["TrainingRun | None"] = relationship("TrainingRun", lazy="raise")
 
     def __repr__(self) -> str:
         """String-Repräsentation."""
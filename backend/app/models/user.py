@@ -5,11 +5,10 @@ FlowAudit User Model
 Datenbankmodell für Benutzer gemäß Nutzerkonzept.
 """
 
-import uuid
 from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, String
+from sqlalchemy import Boolean, DateTime, ForeignKey, String, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -31,11 +30,11 @@ class User(Base):
 
     __tablename__ = "users"
 
-    # Primary Key
+    # Primary Key (String(36), da Demo-User Nicht-UUID-IDs verwenden)
     id: Mapped[str] = mapped_column(
         String(36),
         primary_key=True,
-        default=lambda: str(uuid.uuid4()),
+        server_default=text("gen_random_uuid()::text"),
     )
 
     # Login & Auth
@@ -117,6 +116,7 @@ class User(Base):
         "Project",
         foreign_keys=[assigned_project_id],
         back_populates="assigned_users",
+        lazy="raise",
     )
 
     # Für Extern-Zugang: Zeitbegrenzung
@@ -136,6 +136,7 @@ class User(Base):
         "User",
         remote_side=[id],
         foreign_keys=[invited_by_id],
+        lazy="raise",
     )
 
     # Tracking (Throttled - max. alle 5 Min aktualisiert)
@@ -146,7 +147,7 @@ class User(Base):
     )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(UTC),
+        server_default=func.now(),
         nullable=False,
     )
 
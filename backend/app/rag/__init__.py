@@ -5,7 +5,12 @@ FlowAudit RAG Module
 RAG-Komponente mit ChromaDB für Few-Shot-Learning.
 """
 
-from .embeddings import EmbeddingModel, get_embedding_model
+from .embeddings import (
+    EmbeddingBackend,
+    EmbeddingModel,
+    get_embedding_model,
+    get_loaded_embedding_model,
+)
 from .service import (
     FewShotExample,
     RAGContext,
@@ -13,16 +18,28 @@ from .service import (
     get_rag_service,
     init_default_patterns,
 )
-from .vectorstore import SearchResult, VectorStore, get_vectorstore
+from .vectorstore import (
+    ErrorExampleSpec,
+    InvoiceExampleSpec,
+    PatternSpec,
+    SearchResult,
+    VectorStore,
+    get_vectorstore,
+)
 
 __all__ = [
     # Embeddings
+    "EmbeddingBackend",
     "EmbeddingModel",
     "get_embedding_model",
+    "get_loaded_embedding_model",
     # VectorStore
     "VectorStore",
     "get_vectorstore",
     "SearchResult",
+    "InvoiceExampleSpec",
+    "ErrorExampleSpec",
+    "PatternSpec",
     # Service
     "RAGService",
     "get_rag_service",
@@ -0,0 +1,354 @@
+# Pfad: /backend/app/rag/embedding_cache.py
+"""
+FlowAudit Embedding Cache
+
+Cache für Embeddings, adressiert über einen Hash des Textes. Eine
+prozesslokale LRU-Schicht liegt vor einer optionalen SQLite-Datei, die
+zwischen Prozessen (API, Celery-Worker) und über Neustarts geteilt wird.
+Optional findet ein SimHash-Index fast gleiche Texte (z.B. Rechnungen
+desselben Lieferanten mit neuer Nummer und neuem Datum).
+"""
+
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from itertools import pairwise
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_DIGITS_RE = re.compile(r"\d+")
+_TOKEN_RE = re.compile(r"\w+")
+
+
+class EmbeddingCache:
+    """
+    Zweistufiger Embedding-Cache (Speicher, optional SQLite).
+
+    Schlüssel sind 16-Byte-BLAKE2b-Hashes aus Namensraum und Text. Der
+    Namensraum enthält Modell und Backend, damit Vektoren verschiedener
+    Modelle nie verwechselt werden.
+
+    Die SQLite-Datei ist auf max_rows Einträge begrenzt; die ältesten
+    Einträge werden zuerst verdrängt. Jeder Thread nutzt eine eigene
+    Verbindung, SQLite-Zugriffe laufen außerhalb des Speicher-Locks.
+    """
+
+    # Schlüssel pro SELECT (unter dem SQLite-Parameterlimit)
+    SQLITE_BATCH_SIZE = 500
+
+    def __init__(
+        self,
+        namespace: str,
+        maxsize: int = 4096,
+        path: Path | None = None,
+        max_rows: int = 50_000,
+    ):
+        """
+        Initialisiert den Cache.
+
+        Args:
+            namespace: Modellkennung, geht in jeden Schlüssel ein
+            maxsize: Maximale Einträge im Speicher (0 deaktiviert die Schicht)
+            path: SQLite-Datei für den persistenten Cache (None = nur Speicher)
+            max_rows: Maximale Einträge in der SQLite-Datei
+        """
+        self.namespace = namespace
+        self.maxsize = maxsize
+        self.path = path
+        self.max_rows = max_rows
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._local = threading.local()
+        self._db_failed = False
+
+    def key(self, text: str) -> bytes:
+        """Berechnet den Cache-Schlüssel eines Textes."""
+        return hashlib.blake2b(
+            f"{self.namespace}\0{text}".encode(), digest_size=16
+        ).digest()
+
+    def _connection(self) -> sqlite3.Connection | None:
+        """Öffnet die SQLite-Verbindung des aktuellen Threads beim ersten Zugriff."""
+        if self.path is None or self._db_failed:
+            return None
+
+        db: sqlite3.Connection | None = getattr(self._local, "db", None)
+        if db is None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(self.path, timeout=5.0)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings "
+                    "(key BLOB PRIMARY KEY, vector BLOB NOT NULL)"
+                )
+                self._local.db = db
+            except (OSError, sqlite3.Error) as e:
+                logger.warning(f"Embedding cache file {self.path} unavailable: {e}")
+                self._db_failed = True
+                return None
+        return db
+
+    def lookup(self, keys: list[bytes]) -> list[np.ndarray | None]:
+        """
+        Sucht Vektoren zu den Schlüsseln.
+
+        Args:
+            keys: Cache-Schlüssel
+
+        Returns:
+            Vektor je Schlüssel oder None bei Fehlschlag
+        """
+        with self._lock:
+            found: list[np.ndarray | None] = []
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                found.append(vector)
+
+        missing = [key for key, vector in zip(keys, found, strict=True) if vector is None]
+        db = self._connection() if missing else None
+        if db is not None:
+            rows: dict[bytes, bytes] = {}
+            try:
+                for start in range(0, len(missing), self.SQLITE_BATCH_SIZE):
+                    batch = missing[start : start + self.SQLITE_BATCH_SIZE]
+                    placeholders = ",".join("?" * len(batch))
+                    rows.update(
+                        db.execute(
+                            f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                            batch,
+                        ).fetchall()
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache read failed: {e}")
+
+            if rows:
+                with self._lock:
+                    for i, key in enumerate(keys):
+                        if found[i] is None and key in rows:
+                            vector = np.frombuffer(rows[key], dtype=np.float32)
+                            found[i] = vector
+                            self._remember(key, vector)
+
+        hits = sum(vector is not None for vector in found)
+        with self._lock:
+            self.hits += hits
+            self.misses += len(keys) - hits
+        return found
+
+    def store(self, keys: list[bytes], vectors: np.ndarray) -> None:
+        """
+        Legt Vektoren ab.
+
+        Args:
+            keys: Cache-Schlüssel
+            vectors: float32-Vektoren, (N, D)
+        """
+        if not keys:
+            return
+
+        with self._lock:
+            for key, vector in zip(keys, vectors, strict=True):
+                # Kopie, damit die Zeile nicht die ganze Batch-Matrix festhält
+                self._remember(key, np.array(vector, dtype=np.float32))
+
+        db = self._connection()
+        if db is not None:
+            try:
+                with db:
+                    db.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                        [
+                            (key, np.ascontiguousarray(vector, dtype=np.float32).tobytes())
+                            for key, vector in zip(keys, vectors, strict=True)
+                        ],
+                    )
+                    # Neue Zeilen erhalten die höchste rowid: alles unterhalb
+                    # der letzten max_rows rowids ist älter und wird verdrängt
+                    db.execute(
+                        "DELETE FROM embeddings "
+                        "WHERE rowid <= (SELECT max(rowid) FROM embeddings) - ?",
+                        (self.max_rows,),
+                    )
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache write failed: {e}")
+
+    def _remember(self, key: bytes, vector: np.ndarray) -> None:
+        """Legt einen Vektor in der LRU-Schicht ab (Aufrufer hält den Lock)."""
+        if self.maxsize <= 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        """Gibt Trefferstatistik und Füllstand zurück."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "memory_entries": len(self._memory),
+            "persistent": self.path is not None and not self._db_failed,
+            "max_rows": self.max_rows,
+        }
+
+    def clear(self) -> None:
+        """Leert die Speicherschicht und setzt die Statistik zurück."""
+        with self._lock:
+            self._memory.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class SimHashIndex:
+    """
+    Fuzzy-Cache für Embeddings fast gleicher Texte.
+
+    Jeder Text erhält einen 64-Bit-SimHash über Wort-Trigramme; Ziffernfolgen
+    werden vorher vereinheitlicht, damit Rechnungsnummern, Daten und Beträge
+    den Fingerprint nicht verschieben. Ein gespeicherter Vektor wird
+    wiederverwendet, wenn die Hamming-Distanz höchstens max_distance beträgt.
+
+    Der Fingerprint wird in max_distance + 1 Bänder zerlegt: zwei Fingerprints
+    mit höchstens max_distance abweichenden Bits stimmen in mindestens einem
+    Band vollständig überein (Schubfachprinzip). Nur diese Kandidaten werden
+    verglichen.
+    """
+
+    SHINGLE_SIZE = 3
+    # Kürzere Texte sind für SimHash zu unscharf und werden nicht indiziert
+    MIN_SHINGLES = 8
+
+    def __init__(self, max_distance: int = 4, maxsize: int = 4096):
+        """
+        Initialisiert den Index.
+
+        Args:
+            max_distance: Maximale Hamming-Distanz für einen Treffer
+            maxsize: Maximale Einträge (LRU)
+        """
+        self.max_distance = max_distance
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._vectors: OrderedDict[int, np.ndarray] = OrderedDict()
+
+        # Bitmasken der Bänder, möglichst gleich breit
+        bands = max_distance + 1
+        bounds = [round(64 * i / bands) for i in range(bands + 1)]
+        self._bands = [
+            (start, (1 << (stop - start)) - 1)
+            for start, stop in pairwise(bounds)
+        ]
+        self._buckets: list[dict[int, set[int]]] = [{} for _ in self._bands]
+
+    @classmethod
+    def fingerprint(cls, text: str) -> int | None:
+        """
+        Berechnet den SimHash eines Textes.
+
+        Returns:
+            64-Bit-Fingerprint oder None, wenn der Text zu kurz ist
+        """
+        tokens = _TOKEN_RE.findall(_DIGITS_RE.sub("0", text.casefold()))
+        shingles = {
+            " ".join(tokens[i : i + cls.SHINGLE_SIZE])
+            for i in range(len(tokens) - cls.SHINGLE_SIZE + 1)
+        }
+        if len(shingles) < cls.MIN_SHINGLES:
+            return None
+
+        hashes = np.fromiter(
+            (
+                int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "little")
+                for s in shingles
+            ),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        positions = np.arange(64, dtype=np.uint64)
+        bits = (hashes[:, np.newaxis] >> positions) & np.uint64(1)
+        majority = (bits.sum(axis=0) * 2 > len(shingles)).astype(np.uint64)
+        return int((majority << positions).sum())
+
+    def _band_values(self, fingerprint: int) -> list[int]:
+        return [(fingerprint >> start) & mask for start, mask in self._bands]
+
+    def find(self, fingerprint: int) -> np.ndarray | None:
+        """
+        Sucht den Vektor eines Fingerprints mit höchstens max_distance Bits Abstand.
+
+        Returns:
+            Vektor des nächsten Treffers oder None
+        """
+        with self._lock:
+            best: int | None = None
+            best_distance = self.max_distance + 1
+            for bucket, value in zip(self._buckets, self._band_values(fingerprint), strict=True):
+                for candidate in bucket.get(value, ()):
+                    distance = (candidate ^ fingerprint).bit_count()
+                    if distance < best_distance:
+                        best, best_distance = candidate, distance
+
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._vectors.move_to_end(best)
+            return self._vectors[best]
+
+    def add(self, fingerprint: int, vector: np.ndarray) -> None:
+        """Legt einen Vektor unter seinem Fingerprint ab."""
+        if self.maxsize <= 0:
+            return
+
+        with self._lock:
+            if fingerprint not in self._vectors:
+                for bucket, value in zip(
+                    self._buckets, self._band_values(fingerprint), strict=True
+                ):
+                    bucket.setdefault(value, set()).add(fingerprint)
+            self._vectors[fingerprint] = np.array(vector, dtype=np.float32)
+            self._vectors.move_to_end(fingerprint)
+
+            while len(self._vectors) > self.maxsize:
+                evicted, _ = self._vectors.popitem(last=False)
+                for bucket, value in zip(self._buckets, self._band_values(evicted), strict=True):
+                    members = bucket[value]
+                    members.discard(evicted)
+                    if not members:
+                        del bucket[value]
+
+    def stats(self) -> dict[str, Any]:
+        """Gibt Trefferstatistik und Füllstand zurück."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": len(self._vectors),
+            "max_distance": self.max_distance,
+        }
+
+    def clear(self) -> None:
+        """Leert den Index und setzt die Statistik zurück."""
+        with self._lock:
+            self._vectors.clear()
+            for bucket in self._buckets:
+                bucket.clear()
+            self.hits = 0
+            self.misses = 0
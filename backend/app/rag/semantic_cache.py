@@ -0,0 +1,117 @@
+# Pfad: /backend/app/rag/semantic_cache.py
+"""
+FlowAudit Semantic Cache
+
+Prozesslokaler Cache für RAG-Kontexte, der Treffer über die
+Kosinus-Ähnlichkeit des Anfrage-Embeddings findet.
+"""
+
+import threading
+import time
+from collections.abc import Hashable, Sequence
+from typing import Any
+
+import numpy as np
+
+
+class SemanticCache:
+    """
+    Ähnlichkeits-Cache mit fester Größe (Ringpuffer).
+
+    Ein Eintrag trifft, wenn der Schlüssel exakt übereinstimmt, die
+    Kosinus-Ähnlichkeit der Embeddings mindestens ``threshold`` beträgt und
+    er jünger als ``ttl`` Sekunden ist. Bei vollem Puffer wird der älteste
+    Eintrag überschrieben.
+    """
+
+    def __init__(self, threshold: float = 0.97, maxsize: int = 256, ttl: float = 300.0):
+        """
+        Initialisiert den Cache.
+
+        Args:
+            threshold: Minimale Kosinus-Ähnlichkeit für einen Treffer
+            maxsize: Maximale Anzahl Einträge (0 deaktiviert den Cache)
+            ttl: Lebensdauer eines Eintrags in Sekunden
+        """
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._vectors: np.ndarray | None = None
+        self._keys: list[Hashable | None] = [None] * maxsize
+        self._values: list[Any] = [None] * maxsize
+        self._expires: list[float] = [0.0] * maxsize
+        self._size = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        """Anzahl belegter Einträge."""
+        return self._size
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float] | np.ndarray) -> np.ndarray:
+        """L2-normalisiert ein Embedding als float32-Vektor."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def get(self, key: Hashable, embedding: Sequence[float] | np.ndarray) -> Any | None:
+        """
+        Sucht den ähnlichsten Eintrag mit gleichem Schlüssel.
+
+        Args:
+            key: Exakt zu vergleichender Schlüssel (z.B. Ruleset)
+            embedding: Anfrage-Embedding
+
+        Returns:
+            Gecachter Wert oder None.
+        """
+        with self._lock:
+            if self._vectors is None or self._size == 0:
+                return None
+
+            now = time.monotonic()
+            candidates = [
+                i for i in range(self._size) if self._keys[i] == key and self._expires[i] > now
+            ]
+            if not candidates:
+                return None
+
+            similarities = self._vectors[candidates] @ self._normalize(embedding)
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            return self._values[candidates[best]]
+
+    def put(self, key: Hashable, embedding: Sequence[float] | np.ndarray, value: Any) -> None:
+        """
+        Legt einen Eintrag ab.
+
+        Args:
+            key: Schlüssel
+            embedding: Anfrage-Embedding
+            value: Zu cachender Wert
+        """
+        if self.maxsize <= 0:
+            return
+
+        vector = self._normalize(embedding)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.maxsize, vector.shape[0]), dtype=np.float32)
+
+            slot = self._next
+            self._vectors[slot] = vector
+            self._keys[slot] = key
+            self._values[slot] = value
+            self._expires[slot] = time.monotonic() + self.ttl
+            self._next = (slot + 1) % self.maxsize
+            self._size = min(self._size + 1, self.maxsize)
+
+    def clear(self) -> None:
+        """Verwirft alle Einträge."""
+        with self._lock:
+            self._keys = [None] * self.maxsize
+            self._values = [None] * self.maxsize
+            self._size = 0
+            self._next = 0
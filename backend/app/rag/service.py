@@ -5,38 +5,149 @@ FlowAudit RAG Service
 Few-Shot-Learning Service für Rechnungsprüfung.
 """
 
+import asyncio
 import logging
+import threading
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
-from app.services.parser import ParseResult
-from app.services.rule_engine import PrecheckResult
+import numpy as np
 
-from .vectorstore import VectorStore, get_vectorstore
+from app.config import get_settings
 
-logger = logging.getLogger(__name__)
+from .embeddings import get_embedding_model
+from .semantic_cache import SemanticCache
+from .vectorstore import (
+    ErrorExampleSpec,
+    InvoiceExampleSpec,
+    PatternSpec,
+    SearchResult,
+    VectorStore,
+    get_vectorstore,
+)
+
+if TYPE_CHECKING:
+    from app.services.parser import ParseResult
+    from app.services.rule_engine import PrecheckResult
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# Red-Flag-Muster für wirtschaftliche Prüfung
+RED_FLAG_PATTERNS: tuple[PatternSpec, ...] = (
+    PatternSpec(
+        id="red_flag_luxury",
+        type="economic_red_flag",
+        description="Luxusgüter ohne Projektbezug",
+        examples=(
+            "Strandliegen",
+            "Wellnessbehandlung",
+            "Champagner",
+            "Luxushotel",
+        ),
+    ),
+    PatternSpec(
+        id="red_flag_entertainment",
+        type="economic_red_flag",
+        description="Unterhaltung ohne Projektbezug",
+        examples=(
+            "Konzerttickets",
+            "Freizeitpark",
+            "Sportveranstaltung",
+        ),
+    ),
+    PatternSpec(
+        id="red_flag_personal",
+        type="economic_red_flag",
+        description="Persönliche Ausgaben",
+        examples=(
+            "Privatreise",
+            "Geschenke privat",
+            "Kleidung",
+        ),
+    ),
+)
+
+# Typische Leistungsbeschreibungen nach Projekttyp
+SUPPLY_PATTERNS: tuple[PatternSpec, ...] = (
+    PatternSpec(
+        id="supply_it_project",
+        type="supply_description",
+        description="IT-Projektleistungen",
+        examples=(
+            "Softwareentwicklung",
+            "Programmierung",
+            "IT-Beratung",
+            "Cloud-Services",
+            "Serverhosting",
+        ),
+        project_type="IT",
+    ),
+    PatternSpec(
+        id="supply_research",
+        type="supply_description",
+        description="Forschungsleistungen",
+        examples=(
+            "Laboranalyse",
+            "Studienteilnahme",
+            "Forschungsmaterial",
+            "Wissenschaftliche Beratung",
+        ),
+        project_type="RESEARCH",
+    ),
+    PatternSpec(
+        id="supply_event",
+        type="supply_description",
+        description="Veranstaltungsleistungen",
+        examples=(
+            "Konferenzraum",
+            "Catering",
+            "Technik-Verleih",
+            "Moderationsleistung",
+        ),
+        project_type="EVENT",
+    ),
+)
+
+DEFAULT_PATTERNS: tuple[PatternSpec, ...] = RED_FLAG_PATTERNS + SUPPLY_PATTERNS
+
+
+@dataclass(slots=True, frozen=True)
 class FewShotExample:
     """Few-Shot-Beispiel für LLM-Prompt."""
 
     example_type: str  # "invoice", "error", "pattern"
     content: str
-    metadata: dict[str, Any]
+    metadata: Mapping[str, Any]
     relevance_score: float
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RAGContext:
-    """RAG-Kontext für LLM-Analyse."""
+    """
+    RAG-Kontext für LLM-Analyse.
 
-    similar_invoices: list[FewShotExample]
-    error_corrections: list[FewShotExample]
-    semantic_patterns: list[FewShotExample]
+    Unveränderlich, da Instanzen über den Semantic Cache zwischen
+    Analysen geteilt werden.
+    """
+
+    similar_invoices: tuple[FewShotExample, ...]
+    error_corrections: tuple[FewShotExample, ...]
+    semantic_patterns: tuple[FewShotExample, ...]
     total_examples: int
 
 
+@dataclass(slots=True)
+class _LookupPlan:
+    """Gesammelte Suchtexte einer Analyse (Reihenfolge wie in queries)."""
+
+    errors: list[Any]
+    supply_text: str | None
+    queries: list[str]
+
+
 class RAGService:
     """
     RAG Service für Few-Shot-Learning.
@@ -47,6 +158,27 @@ class RAGService:
     - Semantischen Mustern
     """
 
+    # Relevanz-Schwellen (Score 0-1) je Trefferart
+    _INVOICE_THRESHOLD = 0.5
+    _ERROR_THRESHOLD = 0.4
+    _PATTERN_THRESHOLD = 0.3
+    _RED_FLAG_THRESHOLD = 0.6  # Höhere Schwelle für Red Flags
+
+    # Eingabefenster für Suchtexte
+    _MAX_PRECHECK_ERRORS = 3
+    _RAW_TEXT_ERROR_WINDOW = 500
+    _RAW_TEXT_RED_FLAG_WINDOW = 1500
+
+    # Umfang der Beispiele im Prompt
+    _PROMPT_EXAMPLES_PER_SECTION = 2
+    _PROMPT_INVOICE_CHARS = 500
+    _PROMPT_ERROR_CHARS = 300
+
+    # Feste Zeichen der Beispiel-Vorlagen (Untergrenze ohne Metadaten)
+    _INVOICE_EXAMPLE_OVERHEAD = 43
+    _ERROR_EXAMPLE_OVERHEAD = 63
+    _PATTERN_EXAMPLE_OVERHEAD = 16
+
     def __init__(self, vectorstore: VectorStore | None = None):
         """
         Initialisiert RAG Service.
@@ -56,10 +188,21 @@ class RAGService:
         """
         self._vectorstore = vectorstore or get_vectorstore()
 
+        # Lern-Schreibvorgänge blockieren keine Requests
+        self._write_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="rag-write")
+
+        # Kontexte nahezu identischer Rechnungen wiederverwenden
+        settings = get_settings()
+        self._context_cache = SemanticCache(
+            threshold=settings.rag_semantic_cache_threshold,
+            maxsize=settings.rag_semantic_cache_size,
+            ttl=settings.rag_semantic_cache_ttl,
+        )
+
     def get_context_for_analysis(
         self,
-        parse_result: ParseResult,
-        precheck_result: PrecheckResult,
+        parse_result: "ParseResult",
+        precheck_result: "PrecheckResult",
         project_context: dict[str, Any] | None = None,
         max_examples: int = 5,
     ) -> RAGContext:
@@ -75,89 +218,222 @@ class RAGService:
         Returns:
             RAGContext mit Few-Shot-Beispielen
         """
-        similar_invoices: list[FewShotExample] = []
-        error_corrections: list[FewShotExample] = []
-        semantic_patterns: list[FewShotExample] = []
+        plan = self._plan_lookups(parse_result, precheck_result)
+        embeddings = get_embedding_model().embed_texts_np(plan.queries)
 
-        # 1. Ähnliche Rechnungen suchen
-        invoice_results = self._vectorstore.find_similar_invoices(
-            raw_text=parse_result.raw_text,
-            extracted_data={
-                k: v.value for k, v in parse_result.extracted.items()
-            },
-            n_results=max_examples,
-            ruleset_id=precheck_result.ruleset_id,
-        )
+        cache_key = self._cache_key(plan, precheck_result.ruleset_id, max_examples)
+        cached: RAGContext | None = self._context_cache.get(cache_key, embeddings[0])
+        if cached is not None:
+            return cached
 
-        for result in invoice_results:
-            if result.score > 0.5:  # Relevanz-Schwelle
-                similar_invoices.append(FewShotExample(
-                    example_type="invoice",
-                    content=result.document,
-                    metadata=result.metadata,
-                    relevance_score=result.score,
-                ))
+        lookups = self._build_lookups(plan, embeddings, precheck_result.ruleset_id, max_examples)
+        context = self._assemble_context(plan, [lookup() for lookup in lookups])
+        self._context_cache.put(cache_key, embeddings[0], context)
+        return context
 
-        # 2. Fehlerbeispiele für gefundene Fehler suchen
-        for error in precheck_result.errors[:3]:  # Max 3 Fehler
-            error_results = self._vectorstore.find_similar_errors(
+    async def aget_context_for_analysis(
+        self,
+        parse_result: "ParseResult",
+        precheck_result: "PrecheckResult",
+        project_context: dict[str, Any] | None = None,
+        max_examples: int = 5,
+    ) -> RAGContext:
+        """
+        Async-Variante von get_context_for_analysis.
+
+        Die voneinander unabhängigen ChromaDB-Abfragen laufen parallel in
+        Threads, statt nacheinander auf jeden Roundtrip zu warten.
+
+        Args:
+            parse_result: Parse-Ergebnis
+            precheck_result: Vorprüfungsergebnis
+            project_context: Projekt-Kontext
+            max_examples: Max. Anzahl Beispiele
+
+        Returns:
+            RAGContext mit Few-Shot-Beispielen
+        """
+        plan = self._plan_lookups(parse_result, precheck_result)
+        embeddings = await asyncio.to_thread(get_embedding_model().embed_texts_np, plan.queries)
+
+        cache_key = self._cache_key(plan, precheck_result.ruleset_id, max_examples)
+        cached: RAGContext | None = self._context_cache.get(cache_key, embeddings[0])
+        if cached is not None:
+            return cached
+
+        lookups = self._build_lookups(plan, embeddings, precheck_result.ruleset_id, max_examples)
+        results = await asyncio.gather(*(asyncio.to_thread(lookup) for lookup in lookups))
+        context = self._assemble_context(plan, list(results))
+        self._context_cache.put(cache_key, embeddings[0], context)
+        return context
+
+    @staticmethod
+    def _cache_key(plan: _LookupPlan, ruleset_id: str, max_examples: int) -> tuple[Any, ...]:
+        """
+        Exakter Teil des Cache-Schlüssels.
+
+        Gesuchte Fehler und Leistungsbeschreibung müssen übereinstimmen;
+        über den Rechnungstext entscheidet die Embedding-Ähnlichkeit.
+        """
+        errors = tuple(
+            (error.error_type.value if error.error_type else None, error.feature_id)
+            for error in plan.errors
+        )
+        return (ruleset_id, max_examples, errors, plan.supply_text)
+
+    def _plan_lookups(
+        self,
+        parse_result: "ParseResult",
+        precheck_result: "PrecheckResult",
+    ) -> _LookupPlan:
+        """Sammelt alle Suchtexte, damit sie in einem Batch eingebettet werden."""
+        errors = precheck_result.errors[: self._MAX_PRECHECK_ERRORS]
+        supply_desc = parse_result.extracted.get("supply_description")
+        supply_text = str(supply_desc.value) if supply_desc and supply_desc.value else None
+
+        queries = [
+            self._vectorstore.invoice_query_text(
+                parse_result.raw_text,
+                parse_result.extracted_values,
+            ),
+            parse_result.raw_text[: self._RAW_TEXT_RED_FLAG_WINDOW],
+        ]
+        queries.extend(
+            self._vectorstore.error_query_text(
                 error_type=error.error_type.value if error.error_type else "UNKNOWN",
                 feature_id=error.feature_id,
-                context_text=parse_result.raw_text[:500],
-                n_results=2,
-                ruleset_id=precheck_result.ruleset_id,
+                context_text=parse_result.raw_text[: self._RAW_TEXT_ERROR_WINDOW],
             )
+            for error in errors
+        )
+        if supply_text:
+            queries.append(supply_text)
 
-            for result in error_results:
-                if result.score > 0.4:
-                    error_corrections.append(FewShotExample(
-                        example_type="error",
-                        content=result.document,
-                        metadata={
-                            **result.metadata,
-                            "related_error": error.feature_id,
-                        },
-                        relevance_score=result.score,
-                    ))
+        return _LookupPlan(errors=errors, supply_text=supply_text, queries=queries)
 
-        # 3. Semantische Muster für Leistungsbeschreibung
-        supply_desc = parse_result.extracted.get("supply_description")
-        if supply_desc and supply_desc.value:
-            pattern_results = self._vectorstore.find_matching_patterns(
-                text=str(supply_desc.value),
-                pattern_type="supply_description",
-                n_results=3,
-            )
+    def _build_lookups(
+        self,
+        plan: _LookupPlan,
+        embeddings: np.ndarray,
+        ruleset_id: str,
+        max_examples: int,
+    ) -> list[Callable[[], list[SearchResult]]]:
+        """
+        Erstellt die Vektorsuchen in fester Reihenfolge.
 
-            for result in pattern_results:
-                if result.score > 0.3:
-                    semantic_patterns.append(FewShotExample(
-                        example_type="pattern",
-                        content=result.document,
-                        metadata=result.metadata,
-                        relevance_score=result.score,
-                    ))
-
-        # 4. Red-Flag-Muster prüfen
-        red_flag_results = self._vectorstore.find_matching_patterns(
-            text=parse_result.raw_text[:1500],
-            pattern_type="economic_red_flag",
-            n_results=2,
+        Reihenfolge: Rechnungen, Red Flags, je Fehler eine Suche,
+        optional Leistungsbeschreibung.
+        """
+        invoice_embedding, red_flag_embedding, *other_embeddings = embeddings
+        vectorstore = self._vectorstore
+
+        lookups: list[Callable[[], list[SearchResult]]] = [
+            partial(
+                vectorstore.find_similar_invoices_by_embedding,
+                invoice_embedding,
+                n_results=max_examples,
+                ruleset_id=ruleset_id,
+            ),
+            partial(
+                vectorstore.find_matching_patterns_by_embedding,
+                red_flag_embedding,
+                pattern_type="economic_red_flag",
+                n_results=2,
+            ),
+        ]
+        lookups.extend(
+            partial(
+                vectorstore.find_similar_errors_by_embedding,
+                error_embedding,
+                feature_id=error.feature_id,
+                n_results=2,
+                ruleset_id=ruleset_id,
+            )
+            for error, error_embedding in zip(
+                plan.errors, other_embeddings[: len(plan.errors)], strict=True
+            )
         )
+        if plan.supply_text:
+            lookups.append(
+                partial(
+                    vectorstore.find_matching_patterns_by_embedding,
+                    other_embeddings[-1],
+                    pattern_type="supply_description",
+                    n_results=3,
+                )
+            )
+        return lookups
 
-        for result in red_flag_results:
-            if result.score > 0.6:  # Höhere Schwelle für Red Flags
+    def _assemble_context(
+        self,
+        plan: _LookupPlan,
+        results: list[list[SearchResult]],
+    ) -> RAGContext:
+        """Filtert die Suchergebnisse nach Relevanz und baut den RAGContext."""
+        similar_invoices: list[FewShotExample] = []
+        error_corrections: list[FewShotExample] = []
+        semantic_patterns: list[FewShotExample] = []
+
+        invoice_results, red_flag_results, *other_results = results
+        error_results_per_error = other_results[: len(plan.errors)]
+
+        # Chroma liefert Treffer nach Distanz aufsteigend, also nach Score
+        # absteigend sortiert: der erste Treffer unter der Schwelle beendet
+        # die jeweilige Schleife.
+
+        # 1. Ähnliche Rechnungen
+        for result in invoice_results:
+            if result.score <= self._INVOICE_THRESHOLD:
+                break
+            similar_invoices.append(FewShotExample(
+                example_type="invoice",
+                content=result.document,
+                metadata=result.metadata,
+                relevance_score=result.score,
+            ))
+
+        # 2. Fehlerbeispiele für gefundene Fehler
+        for error, error_results in zip(plan.errors, error_results_per_error, strict=True):
+            for result in error_results:
+                if result.score <= self._ERROR_THRESHOLD:
+                    break
+                error_corrections.append(FewShotExample(
+                    example_type="error",
+                    content=result.document,
+                    metadata={
+                        **result.metadata,
+                        "related_error": error.feature_id,
+                    },
+                    relevance_score=result.score,
+                ))
+
+        # 3. Semantische Muster für Leistungsbeschreibung
+        if plan.supply_text:
+            for result in other_results[-1]:
+                if result.score <= self._PATTERN_THRESHOLD:
+                    break
                 semantic_patterns.append(FewShotExample(
-                    example_type="red_flag",
+                    example_type="pattern",
                     content=result.document,
                     metadata=result.metadata,
                     relevance_score=result.score,
                 ))
 
+        # 4. Red-Flag-Muster
+        for result in red_flag_results:
+            if result.score <= self._RED_FLAG_THRESHOLD:
+                break
+            semantic_patterns.append(FewShotExample(
+                example_type="red_flag",
+                content=result.document,
+                metadata=result.metadata,
+                relevance_score=result.score,
+            ))
+
         return RAGContext(
-            similar_invoices=similar_invoices,
-            error_corrections=error_corrections,
-            semantic_patterns=semantic_patterns,
+            similar_invoices=tuple(similar_invoices),
+            error_corrections=tuple(error_corrections),
+            semantic_patterns=tuple(semantic_patterns),
             total_examples=len(similar_invoices) + len(error_corrections) + len(semantic_patterns),
         )
 
@@ -176,34 +452,46 @@ class RAGService:
         Returns:
             Formatierter Text für Prompt
         """
+        sections: tuple[
+            tuple[str, Sequence[FewShotExample], Callable[[FewShotExample, int], str], int, int],
+            ...,
+        ] = (
+            (
+                "=== ÄHNLICHE RECHNUNGEN (validiert) ===",
+                rag_context.similar_invoices,
+                self._format_invoice_example,
+                self._PROMPT_INVOICE_CHARS,
+                self._INVOICE_EXAMPLE_OVERHEAD,
+            ),
+            (
+                "\n=== FEHLERBEISPIELE MIT KORREKTUREN ===",
+                rag_context.error_corrections,
+                self._format_error_example,
+                self._PROMPT_ERROR_CHARS,
+                self._ERROR_EXAMPLE_OVERHEAD,
+            ),
+            (
+                "\n=== RELEVANTE MUSTER ===",
+                rag_context.semantic_patterns,
+                lambda example, _index: self._format_pattern_example(example),
+                0,
+                self._PATTERN_EXAMPLE_OVERHEAD,
+            ),
+        )
+
         parts: list[str] = []
         current_chars = 0
 
-        # Ähnliche Rechnungen
-        if rag_context.similar_invoices:
-            parts.append("=== ÄHNLICHE RECHNUNGEN (validiert) ===")
-            for i, example in enumerate(rag_context.similar_invoices[:2], 1):
-                example_text = self._format_invoice_example(example, i)
-                if current_chars + len(example_text) > max_chars:
-                    break
-                parts.append(example_text)
-                current_chars += len(example_text)
-
-        # Fehlerbeispiele
-        if rag_context.error_corrections:
-            parts.append("\n=== FEHLERBEISPIELE MIT KORREKTUREN ===")
-            for i, example in enumerate(rag_context.error_corrections[:2], 1):
-                example_text = self._format_error_example(example, i)
-                if current_chars + len(example_text) > max_chars:
+        for header, examples, formatter, content_chars, overhead in sections:
+            if not examples:
+                continue
+            parts.append(header)
+            for i, example in enumerate(examples[: self._PROMPT_EXAMPLES_PER_SECTION], 1):
+                # Untergrenze der Länge prüfen, bevor der Text gebaut wird
+                projected = min(len(example.content), content_chars) + overhead
+                if current_chars + projected > max_chars:
                     break
-                parts.append(example_text)
-                current_chars += len(example_text)
-
-        # Semantische Muster
-        if rag_context.semantic_patterns:
-            parts.append("\n=== RELEVANTE MUSTER ===")
-            for example in rag_context.semantic_patterns[:2]:
-                example_text = self._format_pattern_example(example)
+                example_text = formatter(example, i)
                 if current_chars + len(example_text) > max_chars:
                     break
                 parts.append(example_text)
@@ -218,7 +506,7 @@ class RAGService:
 
         return f"""
 Beispiel {index} (Bewertung: {assessment}, Fehler: {'ja' if has_errors else 'nein'}):
-{example.content[:500]}
+{example.content[: self._PROMPT_INVOICE_CHARS]}
 ---"""
 
     def _format_error_example(self, example: FewShotExample, index: int) -> str:
@@ -232,7 +520,7 @@ Fehlerbeispiel {index}:
 - Feature: {feature_id}
 - Fehlertyp: {error_type}
 - Korrektur: {correct_value}
-{example.content[:300]}
+{example.content[: self._PROMPT_ERROR_CHARS]}
 ---"""
 
     def _format_pattern_example(self, example: FewShotExample) -> str:
@@ -252,15 +540,19 @@ Muster ({pattern_type}):
     def learn_from_validation(
         self,
         document_id: str,
-        parse_result: ParseResult,
+        parse_result: "ParseResult",
         final_assessment: str,
         corrections: list[dict[str, Any]] | None = None,
         ruleset_id: str = "DE_USTG",
-        chunking_config: dict | None = None,
-    ):
+        chunking_config: dict[str, Any] | None = None,
+        sync: bool = False,
+    ) -> Future[None] | None:
         """
         Lernt aus validierter Rechnung.
 
+        Die Schreibvorgänge laufen im Hintergrund-Pool, damit der aufrufende
+        Request nicht auf Embedding und ChromaDB warten muss.
+
         Args:
             document_id: Dokument-ID
             parse_result: Parse-Ergebnis
@@ -268,36 +560,82 @@ Muster ({pattern_type}):
             corrections: Korrekturen durch Benutzer
             ruleset_id: Ruleset
             chunking_config: Optional Chunking-Konfiguration vom Dokumenttyp
+            sync: Synchron schreiben (z.B. für Tests)
+
+        Returns:
+            Future des Hintergrund-Jobs, bei sync=True None
         """
-        # Rechnung als Beispiel speichern (mit optionalem Chunking)
-        self._vectorstore.add_invoice_example(
+        invoice = InvoiceExampleSpec(
             document_id=document_id,
             raw_text=parse_result.raw_text,
-            extracted_data={
-                k: v.value for k, v in parse_result.extracted.items()
-            },
+            extracted_data=parse_result.extracted_values,
             assessment=final_assessment,
             errors=corrections,
             ruleset_id=ruleset_id,
             chunking_config=chunking_config,
         )
 
-        # Korrekturen als Fehlerbeispiele speichern
-        if corrections:
-            for i, correction in enumerate(corrections):
-                error_id = f"{document_id}_error_{i}"
-                self._vectorstore.add_error_example(
-                    error_id=error_id,
-                    error_type=correction.get("error_type", "UNKNOWN"),
-                    feature_id=correction.get("feature_id", ""),
-                    context_text=correction.get("context", parse_result.raw_text[:500]),
-                    wrong_value=correction.get("wrong_value", ""),
-                    correct_value=correction.get("correct_value", ""),
-                    reasoning=correction.get("reasoning", ""),
-                    ruleset_id=ruleset_id,
-                )
+        # Korrekturen als Fehlerbeispiele
+        error_examples = [
+            ErrorExampleSpec(
+                error_id=f"{document_id}_error_{i}",
+                error_type=correction.get("error_type", "UNKNOWN"),
+                feature_id=correction.get("feature_id", ""),
+                context_text=correction.get(
+                    "context", parse_result.raw_text[: self._RAW_TEXT_ERROR_WINDOW]
+                ),
+                wrong_value=correction.get("wrong_value", ""),
+                correct_value=correction.get("correct_value", ""),
+                reasoning=correction.get("reasoning", ""),
+                ruleset_id=ruleset_id,
+            )
+            for i, correction in enumerate(corrections or [])
+        ]
+
+        job = partial(self._store_validation, invoice, error_examples)
+        if sync:
+            job()
+            return None
+        future = self._write_pool.submit(job)
+        future.add_done_callback(partial(self._log_write_failure, document_id))
+        return future
+
+    def _store_validation(
+        self,
+        invoice: InvoiceExampleSpec,
+        error_examples: list[ErrorExampleSpec],
+    ) -> None:
+        """Bettet Rechnung und Korrekturen in einem Batch ein und speichert sie."""
+        texts = [self._vectorstore.invoice_query_text(invoice.raw_text, invoice.extracted_data)]
+        texts.extend(
+            self._vectorstore.error_example_text(
+                example.error_type,
+                example.feature_id,
+                example.context_text,
+                example.wrong_value,
+                example.correct_value,
+                example.reasoning,
+            )
+            for example in error_examples
+        )
+        # Exakte Embeddings (ohne Fuzzy-Cache): sie werden dauerhaft gespeichert
+        embeddings = get_embedding_model().embed_texts_np(texts)
 
-        logger.info(f"Learned from document: {document_id}")
+        # Rechnung als Beispiel speichern (mit optionalem Chunking)
+        self._vectorstore.add_invoice_examples([invoice], embeddings=embeddings[:1])
+        self._vectorstore.add_error_examples(error_examples, embeddings=embeddings[1:])
+
+        self._context_cache.clear()
+        logger.info(f"Learned from document: {invoice.document_id}")
+
+    @staticmethod
+    def _log_write_failure(document_id: str, future: Future[None]) -> None:
+        """Protokolliert Fehler eines Hintergrund-Schreibjobs."""
+        exc = future.exception()
+        if exc is not None:
+            logger.error(
+                f"Learning from document {document_id} failed: {exc}", exc_info=exc
+            )
 
     def add_semantic_pattern(
         self,
@@ -306,7 +644,7 @@ Muster ({pattern_type}):
         description: str,
         examples: list[str],
         project_type: str | None = None,
-    ):
+    ) -> None:
         """
         Fügt semantisches Muster hinzu.
 
@@ -324,16 +662,37 @@ Muster ({pattern_type}):
             examples=examples,
             project_type=project_type,
         )
+        self._context_cache.clear()
+
+    def add_semantic_patterns(self, specs: Sequence[PatternSpec]) -> None:
+        """
+        Fügt mehrere semantische Muster in einem Batch hinzu.
+
+        Args:
+            specs: Musterdefinitionen
+        """
+        self._vectorstore.add_patterns_bulk(specs)
+        self._context_cache.clear()
 
     def get_stats(self) -> dict[str, Any]:
         """Gibt RAG-Statistiken zurück."""
-        return {
+        model = get_embedding_model()
+        stats: dict[str, Any] = {
             "collections": self._vectorstore.get_collection_stats(),
+            "embedding_cache": model.cache.stats(),
         }
+        if model.fuzzy_cache is not None:
+            stats["embedding_fuzzy_cache"] = model.fuzzy_cache.stats()
+        return stats
+
+    async def aget_stats(self) -> dict[str, Any]:
+        """Async-Variante von get_stats (Collection-Zählung per HTTP)."""
+        return await asyncio.to_thread(self.get_stats)
 
 
 # Singleton
 _rag_service: RAGService | None = None
+_rag_service_lock = threading.Lock()
 
 
 def get_rag_service() -> RAGService:
@@ -345,105 +704,13 @@ def get_rag_service() -> RAGService:
     """
     global _rag_service
     if _rag_service is None:
-        _rag_service = RAGService()
+        with _rag_service_lock:
+            if _rag_service is None:
+                _rag_service = RAGService()
     return _rag_service
 
 
-def init_default_patterns():
+def init_default_patterns() -> None:
     """Initialisiert Standard-Muster für RAG."""
-    service = get_rag_service()
-
-    # Red-Flag-Muster für wirtschaftliche Prüfung
-    red_flags = [
-        {
-            "id": "red_flag_luxury",
-            "type": "economic_red_flag",
-            "description": "Luxusgüter ohne Projektbezug",
-            "examples": [
-                "Strandliegen",
-                "Wellnessbehandlung",
-                "Champagner",
-                "Luxushotel",
-            ],
-        },
-        {
-            "id": "red_flag_entertainment",
-            "type": "economic_red_flag",
-            "description": "Unterhaltung ohne Projektbezug",
-            "examples": [
-                "Konzerttickets",
-                "Freizeitpark",
-                "Sportveranstaltung",
-            ],
-        },
-        {
-            "id": "red_flag_personal",
-            "type": "economic_red_flag",
-            "description": "Persönliche Ausgaben",
-            "examples": [
-                "Privatreise",
-                "Geschenke privat",
-                "Kleidung",
-            ],
-        },
-    ]
-
-    for rf in red_flags:
-        service.add_semantic_pattern(
-            pattern_id=rf["id"],
-            pattern_type=rf["type"],
-            description=rf["description"],
-            examples=rf["examples"],
-        )
-
-    # Typische Leistungsbeschreibungen nach Projekttyp
-    supply_patterns = [
-        {
-            "id": "supply_it_project",
-            "type": "supply_description",
-            "description": "IT-Projektleistungen",
-            "examples": [
-                "Softwareentwicklung",
-                "Programmierung",
-                "IT-Beratung",
-                "Cloud-Services",
-                "Serverhosting",
-            ],
-            "project_type": "IT",
-        },
-        {
-            "id": "supply_research",
-            "type": "supply_description",
-            "description": "Forschungsleistungen",
-            "examples": [
-                "Laboranalyse",
-                "Studienteilnahme",
-                "Forschungsmaterial",
-                "Wissenschaftliche Beratung",
-            ],
-            "project_type": "RESEARCH",
-        },
-        {
-            "id": "supply_event",
-            "type": "supply_description",
-            "description": "Veranstaltungsleistungen",
-            "examples": [
-                "Konferenzraum",
-                "Catering",
-                "Technik-Verleih",
-                "Moderationsleistung",
-            ],
-            "project_type": "EVENT",
-        },
-    ]
-
-    for sp in supply_patterns:
-        service.add_semantic_pattern(
-            pattern_id=sp["id"],
-            pattern_type=sp["type"],
-            description=sp["description"],
-            examples=sp["examples"],
-            project_type=sp.get("project_type"),
-        )
-
+    get_rag_service().add_semantic_patterns(DEFAULT_PATTERNS)
     logger.info("Initialized default RAG patterns")
@@ -14,6 +14,7 @@ import time
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
+from functools import cached_property
 from pathlib import Path
 from typing import Any
 
@@ -106,6 +107,11 @@ class ParseResult:
     timings_ms: dict[str, int]
     error: str | None = None
 
+    @cached_property
+    def extracted_values(self) -> dict[str, Any]:
+        """Extrahierte Werte ohne Metadaten (feature_id -> value)."""
+        return {k: v.value for k, v in self.extracted.items()}
+
 
 class PDFParser:
     """
@@ -182,11 +182,13 @@ DEFAULT_STYLE = {
 from sqlalchemy import select
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
 from app.config import get_settings
+from app.database import json_deserializer, json_serializer
 from app.llm import InvoiceAnalysisRequest, get_llm_adapter
 from app.models.document import Document
-from app.models.enums import DocumentStatus, Provider
+from app.models.enums import DocumentStatus, Provider, ResultStatus, TrafficLight
 from app.models.export import ExportJob, GeneratorJob
 from app.models.project import Project
 from app.models.result import AnalysisResult, FinalResult
@@ -217,14 +219,16 @@ def get_celery_session_maker() -> async_sessionmaker[AsyncSession]:
     Erstellt eine neue Engine und SessionMaker für Celery Tasks.
 
     Dies ist notwendig, da Celery in separaten Prozessen/Event-Loops läuft
-    und die globale Engine nicht kompatibel ist.
+    und die globale Engine nicht kompatibel ist. Ohne Pool (NullPool), da
+    jeder Task eine eigene Engine und einen eigenen Event-Loop erhält und
+    gepoolte Verbindungen sonst bis zur Garbage Collection offen blieben.
     """
     engine = create_async_engine(
         settings.database_url,
         echo=settings.debug,
-        pool_size=5,
-        max_overflow=10,
-        pool_pre_ping=True,
+        poolclass=NullPool,
+        json_serializer=json_serializer,
+        json_deserializer=json_deserializer,
     )
     return async_sessionmaker(
         engine,
@@ -298,11 +302,11 @@ def _assessment_to_traffic_light(assessment: str, confidence: float) -> str:
     assessment_lower = assessment.lower()
 
     if assessment_lower == "ok" and confidence >= 0.8:
-        return "GREEN"
+        return TrafficLight.GREEN.value
     elif assessment_lower == "rejected" or confidence < 0.5:
-        return "RED"
+        return TrafficLight.RED.value
     else:
-        return "YELLOW"
+        return TrafficLight.YELLOW.value
 
 
 @celery_app.task(bind=True, max_retries=3)
@@ -481,7 +485,7 @@ async def _analyze_document_async(
 
             # RAG-Kontext holen
             rag_service = get_rag_service()
-            rag_context = rag_service.get_context_for_analysis(
+            rag_context = await rag_service.aget_context_for_analysis(
                 parse_result=parse_result,
                 precheck_result=precheck,
             )
@@ -590,7 +594,7 @@ async def _analyze_document_async(
             )
             final_result = FinalResult(
                 document_id=document_id,
-                status="REVIEW_PENDING",
+                status=ResultStatus.REVIEW_PENDING,
                 fields=[],
                 overall={
                     "traffic_light": traffic_light,
@@ -8,7 +8,7 @@ Pytest fixtures und gemeinsame Test-Konfiguration.
 import asyncio
 from datetime import date
 from decimal import Decimal
-from typing import AsyncGenerator, Generator
+from typing import Any, AsyncGenerator, Callable, Generator
 
 import pytest
 import pytest_asyncio
@@ -56,6 +56,42 @@ async def async_session() -> AsyncGenerator[AsyncSession, None]:
         await conn.run_sync(Base.metadata.drop_all)
 
 
+class FakeResult:
+    """Ergebnis-Attrappe mit den von den Modellen genutzten Zugriffen."""
+
+    def __init__(self, value: Any = None):
+        self._value = value
+
+    def scalars(self) -> Any:
+        return iter(self._value or ())
+
+    def scalar_one_or_none(self) -> Any:
+        return self._value
+
+
+class FakeSession:
+    """
+    AsyncSession-Attrappe für Modell-Hilfsmethoden ohne Datenbank.
+
+    Zeichnet jeden execute-Aufruf als (statement, params) auf. Der Wert des
+    Ergebnisses kommt aus ``returns(params)``.
+    """
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[Any, Any]] = []
+        self.returns: Callable[[Any], Any] = lambda params: None
+
+    async def execute(self, statement: Any, params: Any = None) -> FakeResult:
+        self.calls.append((statement, params))
+        return FakeResult(self.returns(params))
+
+
+@pytest.fixture
+def fake_session() -> FakeSession:
+    """Session-Attrappe, die Statements aufzeichnet statt sie auszuführen."""
+    return FakeSession()
+
+
 @pytest_asyncio.fixture
 async def client() -> AsyncGenerator[AsyncClient, None]:
     """Erstellt Test-HTTP-Client."""
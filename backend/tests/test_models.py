@@ -0,0 +1,309 @@
+# Pfad: /backend/tests/test_models.py
+"""
+FlowAudit Model Tests
+
+Tests für die reinen Python-Hilfsmethoden der SQLAlchemy-Modelle
+(ohne Datenbank).
+"""
+
+import uuid
+
+import pytest
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.models import (
+    FinalResult,
+    Project,
+    ProjectShare,
+    Ruleset,
+    Setting,
+    SolutionFileEntry,
+    SolutionMatch,
+    TrainingExample,
+    TrainingRun,
+)
+from app.models.project_share import hash_share_token
+
+
+class TestRulesetFeatureLookup:
+    """Tests für Ruleset.get_feature_by_id / get_required_features."""
+
+    def test_feature_by_id(self):
+        ruleset = Ruleset(
+            features=[
+                {"feature_id": "invoice_number", "required_level": "REQUIRED"},
+                {"feature_id": "iban", "required_level": "OPTIONAL"},
+            ]
+        )
+        assert ruleset.get_feature_by_id("iban") == {
+            "feature_id": "iban",
+            "required_level": "OPTIONAL",
+        }
+        assert ruleset.get_feature_by_id("unknown") is None
+
+    def test_required_features(self):
+        ruleset = Ruleset(
+            features=[
+                {"feature_id": "invoice_number", "required_level": "REQUIRED"},
+                {"feature_id": "iban", "required_level": "OPTIONAL"},
+            ]
+        )
+        required = ruleset.get_required_features()
+        assert [f["feature_id"] for f in required] == ["invoice_number"]
+        optional = ruleset.get_optional_features()
+        assert [f["feature_id"] for f in optional] == ["iban"]
+
+    def test_cache_invalidated_on_reassign(self):
+        ruleset = Ruleset(features=[{"feature_id": "a", "required_level": "REQUIRED"}])
+        assert ruleset.get_feature_by_id("a") is not None
+
+        ruleset.features = [{"feature_id": "b"}]
+        assert ruleset.get_feature_by_id("a") is None
+        assert ruleset.get_feature_by_id("b") == {"feature_id": "b"}
+        assert ruleset.get_required_features() == ()
+
+
+class TestFinalResultFieldLookup:
+    """Tests für FinalResult.get_field_by_id."""
+
+    def test_field_by_id(self):
+        result = FinalResult(
+            fields=[
+                {"feature_id": "invoice_date", "final_value": "2025-03-01"},
+                {"feature_id": "invoice_date", "final_value": "duplicate"},
+            ]
+        )
+        field = result.get_field_by_id("invoice_date")
+        assert field is not None
+        assert field["final_value"] == "2025-03-01"
+        assert result.get_field_by_id("unknown") is None
+
+    def test_cache_invalidated_on_reassign(self):
+        result = FinalResult(fields=[{"feature_id": "a"}])
+        assert result.get_field_by_id("a") is not None
+
+        result.fields = [{"feature_id": "b"}]
+        assert result.get_field_by_id("a") is None
+        assert result.get_field_by_id("b") == {"feature_id": "b"}
+
+    def test_conflicts(self):
+        result = FinalResult(
+            fields=[
+                {"feature_id": "a", "conflict_flag": True},
+                {"feature_id": "b", "conflict_flag": False},
+            ],
+            overall={"conflicts": ["a"]},
+        )
+        assert result.has_conflicts is True
+        assert result.conflict_fields == [{"feature_id": "a", "conflict_flag": True}]
+
+        empty = FinalResult(fields=[], overall=None)
+        assert empty.has_conflicts is False
+        assert empty.conflict_fields == []
+
+    def test_repr_before_flush(self):
+        result = FinalResult(fields=[], overall={"traffic_light": "GREEN"})
+        assert repr(result) == "<FinalResult neu [?]>"
+
+
+class TestTrainingRepr:
+    """Tests für die Repräsentation noch nicht gespeicherter Training-Zeilen."""
+
+    def test_repr_before_flush(self):
+        assert repr(TrainingExample(module=2)) == "<TrainingExample neu Module 2>"
+        assert repr(TrainingRun(base_model="x")) == "<TrainingRun neu [x]>"
+
+
+class TestShareTokenVerification:
+    """Tests für den Share-Token-Vergleich."""
+
+    def test_project_share_verify_token(self):
+        stored = hash_share_token("abc")
+        assert ProjectShare.verify_token("abc", stored) is True
+        assert ProjectShare.verify_token("abd", stored) is False
+        assert ProjectShare.verify_token("abc", None) is False
+
+    def test_link_share_stores_only_hash(self):
+        share, token = ProjectShare.create_link_share(
+            project_id="p1", created_by_id="u1"
+        )
+        assert share.share_token_hash == hash_share_token(token)
+        assert len(share.share_token_hash) == 32
+        assert ProjectShare.verify_token(token, share.share_token_hash) is True
+
+    def test_project_verify_share_token(self):
+        project = Project(project={}, beneficiary={})
+        token = project.generate_share_token()
+        assert project.verify_share_token(token) is True
+        assert project.verify_share_token(token + "x") is False
+
+        project.revoke_share_token()
+        assert project.verify_share_token(token) is False
+
+    async def test_bulk_create_link_shares(self, fake_session):
+        session = fake_session
+        tokens = await ProjectShare.bulk_create_link_shares(
+            session, project_id="p1", created_by_id="u1", count=3
+        )
+
+        assert len(tokens) == 3
+        assert len(session.calls) == 1
+        _, rows = session.calls[0]
+        assert [row["share_token_hash"] for row in rows] == [
+            hash_share_token(token) for token in tokens
+        ]
+        assert await ProjectShare.bulk_create_link_shares(
+            session, project_id="p1", created_by_id="u1", count=0
+        ) == []
+
+
+class TestProjectAddresses:
+    """Tests für die formatierten Adressen eines Projekts."""
+
+    def test_beneficiary_full_address(self):
+        project = Project(
+            beneficiary={
+                "name": "Muster GmbH",
+                "street": "Hauptstr. 1",
+                "zip": "10115",
+                "city": "Berlin",
+                "country": "DE",
+            },
+            project={},
+        )
+        assert project.get_beneficiary_full_address() == (
+            "Muster GmbH, Hauptstr. 1, 10115 Berlin, DE"
+        )
+        assert project.beneficiary_address.city == "Berlin"
+
+    def test_implementation_full_address(self):
+        project = Project(beneficiary={}, project={})
+        assert project.get_implementation_full_address() is None
+
+        project.project = {"implementation": {"location_name": "Werk 2", "city": "Köln"}}
+        assert project.get_implementation_full_address() == "Werk 2, Köln"
+
+    def test_address_cache_invalidated_on_reassign(self):
+        project = Project(beneficiary={"name": "Alt"}, project={})
+        assert project.get_beneficiary_full_address() == "Alt"
+
+        project.beneficiary = {"name": "Neu", "city": "Hamburg"}
+        assert project.get_beneficiary_full_address() == "Neu, Hamburg"
+
+
+class TestLoaderStrategies:
+    """Tests für die deklarierten Ladestrategien der Relationen."""
+
+    @pytest.mark.parametrize(
+        "attr", ["documents", "batch_jobs", "assigned_users", "solution_files"]
+    )
+    def test_project_collections_raise_on_lazy_load(self, attr):
+        project = Project(id=uuid.uuid4(), beneficiary={}, project={})
+        make_transient_to_detached(project)
+
+        with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+            getattr(project, attr)
+
+    def test_many_to_one_joined(self):
+        assert Project.owner.property.lazy == "joined"
+        assert FinalResult.llm_run.property.lazy == "joined"
+        assert FinalResult.feedback_entries.property.lazy == "selectin"
+        assert ProjectShare.project.property.lazy == "joined"
+        assert ProjectShare.user.property.lazy == "joined"
+
+
+class TestBeneficiaryAliases:
+    """Tests für die Alias-Namen des Begünstigten."""
+
+    def test_aliases_tuple(self):
+        project = Project(beneficiary={"aliases": ["Muster AG", "MAG"]}, project={})
+        assert project.beneficiary_aliases == ("Muster AG", "MAG")
+        assert Project(beneficiary={}, project={}).beneficiary_aliases == ()
+
+    def test_matches_alias_casefold(self):
+        project = Project(beneficiary={"aliases": ["Straße GmbH"]}, project={})
+        assert project.matches_alias("STRASSE GMBH") is True
+        assert project.matches_alias("Andere GmbH") is False
+
+        project.beneficiary = {"aliases": ["Andere GmbH"]}
+        assert project.matches_alias("andere gmbh") is True
+
+
+class TestSolutionMatchBulkCreate:
+    """Tests für SolutionMatch.bulk_create."""
+
+    async def test_single_insert_returns_ids(self, fake_session):
+        session = fake_session
+        session.returns = lambda params: [f"id-{i}" for i in range(len(params))]
+        rows = [
+            {"solution_file_id": "s1", "document_id": "d1", "solution_position": 1},
+            {"solution_file_id": "s1", "document_id": "d2", "solution_position": 2},
+        ]
+        ids = await SolutionMatch.bulk_create(session, rows)
+
+        assert ids == ["id-0", "id-1"]
+        assert len(session.calls) == 1
+        assert session.calls[0][1] is rows
+        assert await SolutionMatch.bulk_create(session, []) == []
+        assert len(session.calls) == 1
+
+
+class TestSolutionMatchEntry:
+    """Tests für die Verknüpfung eines Matches mit seinem Eintrag."""
+
+    def test_entry_referenced_by_id(self):
+        [fk] = SolutionMatch.__table__.c.solution_entry_id.foreign_keys
+        assert fk.target_fullname == "solution_file_entries.id"
+        assert SolutionMatch.solution_entry.property.local_columns == {
+            SolutionMatch.__table__.c.solution_entry_id
+        }
+
+    def test_filename_proxied_from_entry(self):
+        match = SolutionMatch(solution_entry=SolutionFileEntry(position=1, filename="a.pdf"))
+        assert match.solution_filename == "a.pdf"
+
+
+class TestSolutionMatchConfidence:
+    """Tests für die quantisierte Match-Konfidenz."""
+
+    def test_quantize_roundtrip(self):
+        assert SolutionMatch.quantize_confidence(0.8) == 8000
+        assert SolutionMatch.quantize_confidence(1.7) == 10000
+        assert SolutionMatch.quantize_confidence(-0.1) == 0
+
+        match = SolutionMatch(match_confidence=SolutionMatch.quantize_confidence(0.8765))
+        assert match.match_confidence_float == 0.8765
+
+
+class TestSettingCache:
+    """Tests für den prozesslokalen Setting-Cache."""
+
+    async def test_cached_until_invalidated(self, fake_session):
+        session = fake_session
+        session.returns = lambda params: {"provider": "OPENAI"}
+        Setting.invalidate_cache()
+
+        assert await Setting.get_cached(session, "default_llm_provider") == {
+            "provider": "OPENAI"
+        }
+        await Setting.get_cached(session, "default_llm_provider")
+        assert len(session.calls) == 1
+
+        Setting.invalidate_cache("default_llm_provider")
+        await Setting.get_cached(session, "default_llm_provider")
+        assert len(session.calls) == 2
+
+    async def test_returned_value_is_a_copy(self, fake_session):
+        fake_session.returns = lambda params: {"providers": ["OPENAI"]}
+        Setting.invalidate_cache()
+
+        first = await Setting.get_cached(fake_session, "llm_providers")
+        first["providers"].append("OLLAMA")
+        second = await Setting.get_cached(fake_session, "llm_providers")
+        second["extra"] = True
+
+        assert await Setting.get_cached(fake_session, "llm_providers") == {
+            "providers": ["OPENAI"]
+        }
+        assert len(fake_session.calls) == 1
@@ -0,0 +1,449 @@
+# Pfad: /backend/tests/test_rag.py
+"""
+FlowAudit RAG Tests
+
+Tests für die reinen Python-Bausteine des RAG-Systems (ohne ChromaDB und
+ohne Embedding-Modell).
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.rag import semantic_cache as semantic_cache_module
+from app.rag import service as rag_service
+from app.rag import vectorstore as vectorstore_module
+from app.rag.embedding_cache import EmbeddingCache, SimHashIndex
+from app.rag.semantic_cache import SemanticCache
+from app.rag.service import RAGService
+from app.rag.vectorstore import VectorStore
+
+
+class FakeEmbeddingModel:
+    """Liefert feste Vektoren und zählt die eingebetteten Texte."""
+
+    def __init__(self, dimension: int = 4):
+        self.dimension = dimension
+        self.texts: list[str] = []
+
+    def embed_texts_np(self, texts, fuzzy=False):
+        self.texts.extend(texts)
+        return np.ones((len(texts), self.dimension), dtype=np.float32)
+
+
+class RecordingVectorStore:
+    """Zeichnet Schreibaufrufe auf, Suchtexte wie der echte VectorStore."""
+
+    invoice_query_text = staticmethod(VectorStore.invoice_query_text)
+    error_example_text = staticmethod(VectorStore.error_example_text)
+    error_query_text = staticmethod(VectorStore.error_query_text)
+
+    def __init__(self):
+        self.invoices = []
+        self.errors = []
+
+    def add_invoice_examples(self, specs, embeddings=None):
+        self.invoices.extend(zip(specs, embeddings, strict=True))
+
+    def add_error_examples(self, specs, embeddings=None):
+        self.errors.extend(zip(specs, embeddings, strict=True))
+
+    def add_patterns_bulk(self, specs):
+        pass
+
+
+class CountingVectorStore(RecordingVectorStore):
+    """Zählt die Vektorsuchen und liefert keine Treffer."""
+
+    def __init__(self):
+        super().__init__()
+        self.searches = 0
+
+    def _search(self, *args, **kwargs):
+        self.searches += 1
+        return []
+
+    find_similar_invoices_by_embedding = _search
+    find_matching_patterns_by_embedding = _search
+    find_similar_errors_by_embedding = _search
+
+
+class FakeCollection:
+    """Chroma-Collection-Attrappe mit festen gespeicherten Vektoren."""
+
+    def __init__(
+        self, name: str, stored: list[list[float]] | None = None, space: str = "cosine"
+    ):
+        self.name = name
+        self.stored = stored or []
+        self.configuration = {"hnsw": {"space": space}}
+        self.queries = 0
+        self.upserts = 0
+
+    def get(self, limit=None, include=None):
+        return {"embeddings": self.stored[:limit]}
+
+    def query(self, **kwargs):
+        self.queries += 1
+        return {"ids": [[]], "documents": [[]], "metadatas": [[]], "distances": [[]]}
+
+    def upsert(self, **kwargs):
+        self.upserts += 1
+
+
+@pytest.fixture
+def fake_collections(monkeypatch) -> dict[str, FakeCollection]:
+    """VectorStore-Collections als Attrappen; "invoices" enthält 768-dim Vektoren."""
+    collections = {
+        "invoices": FakeCollection("invoices", stored=[[0.0] * 768]),
+        "invoice_chunks": FakeCollection("invoice_chunks"),
+        "errors": FakeCollection("errors"),
+        "patterns": FakeCollection("patterns"),
+    }
+    client = SimpleNamespace(get_or_create_collection=lambda name, **kwargs: collections[name])
+    monkeypatch.setattr(vectorstore_module.chromadb, "HttpClient", lambda **kwargs: client)
+    monkeypatch.setattr(
+        vectorstore_module, "get_settings", lambda: SimpleNamespace(
+            chroma_host="chroma", chroma_port=8000, embedding_model="test-model"
+        )
+    )
+    return collections
+
+
+@pytest.fixture
+def embedding_model(monkeypatch) -> FakeEmbeddingModel:
+    model = FakeEmbeddingModel()
+    monkeypatch.setattr(rag_service, "get_embedding_model", lambda: model)
+    return model
+
+
+def make_parse_result(
+    raw_text: str = "Rechnung Nr. 1", supply_text: str | None = None
+) -> SimpleNamespace:
+    extracted = {}
+    if supply_text is not None:
+        extracted["supply_description"] = SimpleNamespace(value=supply_text)
+    return SimpleNamespace(
+        raw_text=raw_text,
+        extracted=extracted,
+        extracted_values={"gross_amount": "119.00"},
+    )
+
+
+def make_precheck_result(*feature_ids: str) -> SimpleNamespace:
+    errors = [
+        SimpleNamespace(error_type=SimpleNamespace(value="MISSING"), feature_id=feature_id)
+        for feature_id in feature_ids
+    ]
+    return SimpleNamespace(ruleset_id="DE_USTG", errors=errors)
+
+
+class FakeClock:
+    """Steuerbare Uhr für TTL-Tests."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class TestVectorStoreDimension:
+    """Tests für die Dimensionsprüfung der vorberechneten Embeddings."""
+
+    def test_query_with_other_dimension_raises(self, fake_collections):
+        store = VectorStore()
+
+        with pytest.raises(RuntimeError, match="neu aufgebaut"):
+            store.find_similar_invoices_by_embedding(np.ones(384))
+        assert fake_collections["invoices"].queries == 0
+
+    def test_query_with_matching_dimension(self, fake_collections):
+        store = VectorStore()
+
+        assert store.find_similar_invoices_by_embedding(np.ones(768)) == []
+        assert fake_collections["invoices"].queries == 1
+
+    def test_upsert_with_other_dimension_raises(self, fake_collections):
+        store = VectorStore()
+
+        with pytest.raises(RuntimeError, match="768-dimensionale"):
+            store._upsert_batched(
+                fake_collections["invoices"], ["d1"], ["text"], [{}], np.ones((1, 384))
+            )
+        assert fake_collections["invoices"].upserts == 0
+
+    def test_empty_collection_adopts_first_dimension(self, fake_collections):
+        store = VectorStore()
+        errors = fake_collections["errors"]
+
+        store._upsert_batched(errors, ["e1"], ["text"], [{}], np.ones((1, 384)))
+        assert errors.upserts == 1
+        with pytest.raises(RuntimeError):
+            store.find_similar_errors_by_embedding(np.ones(768), feature_id="iban")
+
+
+class TestVectorStoreSpace:
+    """Tests für die Prüfung des Distanzraums bestehender Collections."""
+
+    def test_cosine_collections_do_not_warn(self, fake_collections, caplog):
+        VectorStore()
+
+        assert "Distanzraum" not in caplog.text
+
+    def test_existing_l2_collection_warns(self, fake_collections, caplog):
+        fake_collections["patterns"] = FakeCollection("patterns", space="l2")
+
+        VectorStore()
+
+        assert "'patterns' verwendet Distanzraum 'l2'" in caplog.text
+
+
+class TestSemanticCache:
+    """Tests für den Ähnlichkeits-Cache."""
+
+    def test_hit_on_similar_embedding(self):
+        cache = SemanticCache(threshold=0.95, maxsize=4)
+        cache.put("k", [1.0, 0.0], "value")
+
+        assert cache.get("k", [1.0, 0.01]) == "value"
+
+    def test_miss_below_threshold(self):
+        cache = SemanticCache(threshold=0.95, maxsize=4)
+        cache.put("k", [1.0, 0.0], "value")
+
+        assert cache.get("k", [0.0, 1.0]) is None
+
+    def test_miss_on_key_mismatch(self):
+        cache = SemanticCache(threshold=0.95, maxsize=4)
+        cache.put("k", [1.0, 0.0], "value")
+
+        assert cache.get("other", [1.0, 0.0]) is None
+
+    def test_expired_entry_misses(self, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr(semantic_cache_module, "time", clock)
+        cache = SemanticCache(maxsize=4, ttl=60.0)
+        cache.put("k", [1.0, 0.0], "value")
+
+        clock.now += 59.0
+        assert cache.get("k", [1.0, 0.0]) == "value"
+        clock.now += 2.0
+        assert cache.get("k", [1.0, 0.0]) is None
+
+    def test_ring_buffer_overwrites_oldest(self):
+        cache = SemanticCache(maxsize=2)
+        cache.put("a", [1.0, 0.0], 1)
+        cache.put("b", [1.0, 0.0], 2)
+        cache.put("c", [1.0, 0.0], 3)
+
+        assert len(cache) == 2
+        assert cache.get("a", [1.0, 0.0]) is None
+        assert cache.get("c", [1.0, 0.0]) == 3
+
+    def test_clear(self):
+        cache = SemanticCache(maxsize=4)
+        cache.put("k", [1.0, 0.0], "value")
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.get("k", [1.0, 0.0]) is None
+
+    def test_disabled(self):
+        cache = SemanticCache(maxsize=0)
+        cache.put("k", [1.0, 0.0], "value")
+
+        assert cache.get("k", [1.0, 0.0]) is None
+
+
+class TestContextCache:
+    """Tests für den Kontext-Cache von RAGService.get_context_for_analysis."""
+
+    def test_repeated_query_hits_cache(self, embedding_model):
+        store = CountingVectorStore()
+        service = RAGService(vectorstore=store)
+
+        first = service.get_context_for_analysis(make_parse_result(), make_precheck_result())
+        searches = store.searches
+        second = service.get_context_for_analysis(make_parse_result(), make_precheck_result())
+
+        assert searches == 2
+        assert store.searches == searches
+        assert second is first
+
+    def test_different_errors_miss(self, embedding_model):
+        store = CountingVectorStore()
+        service = RAGService(vectorstore=store)
+
+        service.get_context_for_analysis(make_parse_result(), make_precheck_result("iban"))
+        searches = store.searches
+        service.get_context_for_analysis(make_parse_result(), make_precheck_result("vat_id"))
+
+        assert store.searches == 2 * searches
+
+    def test_different_supply_text_misses(self, embedding_model):
+        store = CountingVectorStore()
+        service = RAGService(vectorstore=store)
+
+        service.get_context_for_analysis(
+            make_parse_result(supply_text="Beratung"), make_precheck_result()
+        )
+        searches = store.searches
+        service.get_context_for_analysis(
+            make_parse_result(supply_text="Bauleistung"), make_precheck_result()
+        )
+
+        assert store.searches == 2 * searches
+
+    def test_learning_clears_cache(self, embedding_model):
+        store = CountingVectorStore()
+        service = RAGService(vectorstore=store)
+
+        service.get_context_for_analysis(make_parse_result(), make_precheck_result())
+        searches = store.searches
+        service.learn_from_validation(
+            document_id="d1", parse_result=make_parse_result(), final_assessment="ok", sync=True
+        )
+        service.get_context_for_analysis(make_parse_result(), make_precheck_result())
+
+        assert store.searches == 2 * searches
+
+    def test_adding_patterns_clears_cache(self, embedding_model):
+        store = CountingVectorStore()
+        service = RAGService(vectorstore=store)
+
+        service.get_context_for_analysis(make_parse_result(), make_precheck_result())
+        service.add_semantic_patterns([])
+
+        assert len(service._context_cache) == 0
+
+
+class TestEmbeddingCache:
+    """Tests für den zweistufigen Embedding-Cache."""
+
+    def test_memory_hit_and_miss(self):
+        cache = EmbeddingCache("model", maxsize=8)
+        keys = [cache.key("a"), cache.key("b")]
+        cache.store(keys[:1], np.ones((1, 4), dtype=np.float32))
+
+        found = cache.lookup(keys)
+
+        assert np.array_equal(found[0], np.ones(4))
+        assert found[1] is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_namespace_separates_keys(self):
+        assert EmbeddingCache("model-a").key("text") != EmbeddingCache("model-b").key("text")
+
+    def test_memory_lru_eviction(self):
+        cache = EmbeddingCache("model", maxsize=2)
+        keys = [cache.key(text) for text in "abc"]
+        cache.store(keys, np.ones((3, 4), dtype=np.float32))
+
+        assert cache.stats()["memory_entries"] == 2
+        assert cache.lookup(keys[:1]) == [None]
+
+    def test_sqlite_shared_between_instances(self, tmp_path):
+        path = tmp_path / "embeddings.sqlite3"
+        writer = EmbeddingCache("model", path=path)
+        key = writer.key("text")
+        writer.store([key], np.full((1, 4), 0.5, dtype=np.float32))
+
+        reader = EmbeddingCache("model", path=path)
+        [vector] = reader.lookup([key])
+
+        assert reader.stats()["persistent"] is True
+        assert np.allclose(vector, 0.5)
+
+    def test_sqlite_max_rows_evicts_oldest(self, tmp_path):
+        path = tmp_path / "embeddings.sqlite3"
+        cache = EmbeddingCache("model", maxsize=0, path=path, max_rows=2)
+        keys = [cache.key(text) for text in "abc"]
+        for key in keys:
+            cache.store([key], np.ones((1, 4), dtype=np.float32))
+
+        found = cache.lookup(keys)
+
+        assert found[0] is None
+        assert found[1] is not None
+        assert found[2] is not None
+
+
+class TestSimHashIndex:
+    """Tests für den Fuzzy-Cache fast gleicher Texte."""
+
+    TEXT = (
+        "Rechnung Nr. 2025-001 vom 15.12.2025 Mustermann GmbH Musterstraße 123 "
+        "Leistung Softwareentwicklung Dezember Nettobetrag 1.000,00 Euro zzgl. MwSt"
+    )
+
+    def test_short_text_has_no_fingerprint(self):
+        assert SimHashIndex.fingerprint("zu kurz") is None
+
+    def test_numbers_do_not_change_fingerprint(self):
+        other = self.TEXT.replace("2025-001", "2026-417").replace("15.12.2025", "03.02.2026")
+
+        assert SimHashIndex.fingerprint(other) == SimHashIndex.fingerprint(self.TEXT)
+
+    def test_near_duplicate_hits(self):
+        index = SimHashIndex(max_distance=4)
+        fingerprint = SimHashIndex.fingerprint(self.TEXT)
+        index.add(fingerprint, np.ones(4))
+
+        assert np.array_equal(index.find(fingerprint ^ 0b101), np.ones(4))
+        assert index.stats()["hits"] == 1
+
+    def test_distant_fingerprint_misses(self):
+        index = SimHashIndex(max_distance=4)
+        fingerprint = SimHashIndex.fingerprint(self.TEXT)
+        index.add(fingerprint, np.ones(4))
+
+        assert index.find(fingerprint ^ 0xFFFF) is None
+        assert index.stats()["misses"] == 1
+
+    def test_lru_eviction_removes_buckets(self):
+        index = SimHashIndex(max_distance=2, maxsize=1)
+        index.add(0, np.zeros(4))
+        index.add(2**64 - 1, np.ones(4))
+
+        assert index.find(0) is None
+        assert np.array_equal(index.find(2**64 - 1), np.ones(4))
+
+
+class TestLearnFromValidation:
+    """Tests für RAGService.learn_from_validation."""
+
+    def test_sync_stores_invoice_and_corrections(self, embedding_model):
+        store = RecordingVectorStore()
+        service = RAGService(vectorstore=store)
+        service._context_cache.put(("key",), np.ones(4), "stale")
+
+        result = service.learn_from_validation(
+            document_id="d1",
+            parse_result=make_parse_result(),
+            final_assessment="ok",
+            corrections=[{"feature_id": "iban", "wrong_value": "x", "correct_value": "y"}],
+            sync=True,
+        )
+
+        assert result is None
+        assert [spec.document_id for spec, _ in store.invoices] == ["d1"]
+        assert [spec.error_id for spec, _ in store.errors] == ["d1_error_0"]
+        # Rechnung und Korrektur in einem Batch
+        assert len(embedding_model.texts) == 2
+        assert len(service._context_cache) == 0
+
+    def test_background_write(self, embedding_model):
+        store = RecordingVectorStore()
+        service = RAGService(vectorstore=store)
+
+        future = service.learn_from_validation(
+            document_id="d2", parse_result=make_parse_result(), final_assessment="ok"
+        )
+
+        assert future is not None
+        future.result(timeout=5)
+        assert [spec.document_id for spec, _ in store.invoices] == ["d2"]
+        assert store.errors == []